@@ -0,0 +1,82 @@
+#! /usr/bin/python
+
+"""
+Single entry point for every tool of the project:
+    aps.py <command> [command arguments]
+Each command is implemented by one of the scripts
+in this directory, imported only when the command is run,
+so heavy dependencies (solvers, matplotlib) are loaded
+only by the commands that need them.
+"""
+
+from argparse import ArgumentParser, REMAINDER, RawDescriptionHelpFormatter
+import importlib
+import sys
+
+# command: (script module, description)
+COMMANDS = {
+    "generate": ("instance_generator", "generate a random GLS instance"),
+    "generate-one": ("instance_generator_one", "generate a random model one instance"),
+    "generate-sample": (
+        "aps_instance_generator",
+        "generate a sample instance with locations and radii",
+    ),
+    "generate-family": (
+        "instance_family_generator",
+        "generate a reproducible family of instances from a parameter grid",
+    ),
+    "solve-gls": ("aps_loc_gls", "alpha curves of the double coverage model"),
+    "solve-one": ("aps_loc_one", "alpha curves of model one"),
+    "batch": ("aps_batch", "alpha curves of many instances on one worker pool"),
+    "incremental": (
+        "aps_incremental",
+        "update alpha curves after a small change of the instance",
+    ),
+    "solve-model-one": ("solve_aps_model_one", "solve model one for a given alpha"),
+    "solve-model-one-batch": (
+        "solve_aps_model_one_batch",
+        "solve model one for many (alpha, radius, count) triples",
+    ),
+    "couple": ("solve_best_coupling", "solve the best coupling model"),
+    "plot-alphas": ("plot_max_alphas", "plot alpha curves from a log file"),
+    "plot-locations": ("plot_locations", "plot customers and stations"),
+    "plot-solution": ("plot_model_one_solution", "plot a model one solution"),
+    "tune": ("tune_probes", "tune the solver parameters of the probes"),
+    "trace-summary": ("trace_summary", "rank the most expensive tasks of a trace"),
+    "server": ("aps_server", "start the solve service"),
+    "client": ("aps_client", "submit a job to the solve service"),
+}
+
+
+def command_list():
+    lines = ["commands:"]
+    width = max(len(name) for name in COMMANDS) + 2
+    for name, (_, description) in COMMANDS.items():
+        lines.append(f"  {name:<{width}}{description}")
+    lines.append("")
+    lines.append("run 'aps.py <command> --help' for the command arguments")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = ArgumentParser(
+        prog="aps.py",
+        epilog=command_list(),
+        formatter_class=RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("command", choices=COMMANDS, metavar="command")
+    parser.add_argument("args", nargs=REMAINDER, help="command arguments")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    module_name, _ = COMMANDS[args.command]
+    module = importlib.import_module(module_name)
+    # the command parses its own arguments
+    sys.argv = [f"aps.py {args.command}"] + args.args
+    module.main()
+
+
+if __name__ == "__main__":
+    main()
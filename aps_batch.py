@@ -0,0 +1,137 @@
+#! /usr/bin/python
+
+"""
+Compute the alpha curves of many instances in one run.
+The (instance, configuration, facility count) tasks of
+every instance share a single worker pool, the largest
+instance files first, so workers stay busy until the end.
+Each instance gets its own log, in the format written by
+aps_loc_gls.py and aps_loc_one.py.
+"""
+
+from argparse import ArgumentParser
+from multiprocessing import Pool
+import os
+import queue
+
+from models import (
+    GendreauLaporteSemetInstance,
+    MyModelOneInstance,
+    PoolCallback,
+    make_model,
+)
+from utils import (
+    Log,
+    add_solver_arguments,
+    check_solver_arguments,
+    load_instance,
+    load_json_file,
+    ReachIndex,
+    search_config,
+)
+
+
+def make_tasks(kind, jobs, args, search, intervals, curves):
+    """
+    Yield (function, args, (job, config, count)) for every
+    facility count of every configuration of every job.
+    Instances are loaded only when their tasks are reached,
+    and curves[job] gets a (config, alphas) entry for each
+    configuration, with alphas to be filled.
+    """
+    kls = GendreauLaporteSemetInstance if kind == "gls" else MyModelOneInstance
+    for j, (instance_file, config_file, _) in enumerate(jobs):
+        instance = load_instance(kls, instance_file)
+        reach_index = ReachIndex(instance.distances)
+        config = load_json_file(config_file)
+        models = [
+            make_model(kind, instance, conf, reach_index, args.threads, args.backend)
+            for conf in config
+        ]
+        count = len(models[0].facility_capacity()) if models else 0
+        curves[j] = [(conf, [None] * count) for conf in config]
+        for c, model in enumerate(models):
+            cb = PoolCallback(model, search=search, key=f"{j}:{c}", intervals=intervals)
+            for i in range(count):
+                yield cb.callback, (i,), (j, c, i)
+
+
+def run_tasks(pool, tasks, limit: int):
+    """
+    Run the tasks on pool, at most limit at a time, and
+    yield their (tag, result) couples as they complete
+    """
+    done = queue.Queue()
+
+    def submit(function, args, tag):
+        pool.apply_async(
+            function,
+            args,
+            callback=lambda value: done.put((tag, value, None)),
+            error_callback=lambda err: done.put((tag, None, err)),
+        )
+
+    def result():
+        tag, value, err = done.get()
+        if err is not None:
+            raise err
+        return tag, value
+
+    running = 0
+    for task in tasks:
+        if running >= limit:
+            yield result()
+            running -= 1
+        submit(*task)
+        running += 1
+    for _ in range(running):
+        yield result()
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("model", help="model of the instances", choices=["gls", "one"])
+    parser.add_argument(
+        "jobs_file",
+        help="JSON file with a list of [instance, config, log_file] triples",
+    )
+    add_solver_arguments(parser)
+    parser.add_argument(
+        "--jobs",
+        help="specify the number of parallel jobs to run. Default 1",
+        type=int,
+        default=1,
+    )
+    return check_solver_arguments(parser, parser.parse_args())
+
+
+def main():
+    args = parse_args()
+    jobs = load_json_file(args.jobs_file)
+    # largest instance files first
+    jobs.sort(key=lambda job: -os.path.getsize(job[0]))
+    search = search_config(args)
+    anytime = search.anytime()
+
+    curves = [None] * len(jobs)
+    tasks = make_tasks(args.model, jobs, args, search, anytime, curves)
+    # at most two tasks for each worker: instances are
+    # not loaded long before their tasks run
+    with Pool(args.jobs) as pool:
+        for (j, c, i), alpha in run_tasks(pool, tasks, 2 * args.jobs):
+            curves[j][c][1][i] = alpha
+            if all(None not in alphas for _, alphas in curves[j]):
+                save_log(jobs[j][2], curves[j])
+                curves[j] = None
+                print(f"{jobs[j][0]}: done")
+
+
+def save_log(file_name, curve):
+    log = Log(file_name)
+    for conf, alphas in curve:
+        log.add_entry(conf, alphas)
+    log.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#! /usr/bin/python
+
+"""
+Submit a job to the solve service started
+with aps_server.py. It replaces aps_loc_gls.py
+and aps_loc_one.py: the arguments and the output
+log are the same, results are printed as soon
+as each facility count is solved.
+"""
+
+from argparse import ArgumentParser
+import asyncio
+import os
+import sys
+
+from service.protocol import DEFAULT_SOCKET, LINE_LIMIT, send_message, read_message
+from utils import (
+    Log,
+    load_json_file,
+    add_instance_arguments,
+    add_solver_arguments,
+    check_solver_arguments,
+)
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("model", help="model to solve", choices=["gls", "one"])
+    add_instance_arguments(parser)
+    add_solver_arguments(parser)
+    parser.add_argument(
+        "--socket",
+        help=f"Unix socket of the server. Default {DEFAULT_SOCKET}",
+        default=DEFAULT_SOCKET,
+    )
+    parser.add_argument(
+        "--quiet", help="do not print partial results", action="store_true"
+    )
+    return check_solver_arguments(parser, parser.parse_args())
+
+
+def make_request(args):
+    return {
+        "model": args.model,
+        "instance": os.path.abspath(args.instance),
+        "config": load_json_file(args.config),
+        "threads": args.threads,
+        "backend": args.backend,
+        "probes": args.probes,
+        "discrete": args.discrete,
+        "warm_start": args.warm_start,
+        "bounds": args.bounds,
+        "probe_time_limit": args.probe_time_limit,
+        "time_budget": args.time_budget,
+        "profile": args.profile and os.path.abspath(args.profile),
+    }
+
+
+async def submit(socket_path, request, quiet):
+    reader, writer = await asyncio.open_unix_connection(socket_path, limit=LINE_LIMIT)
+    try:
+        await send_message(writer, request)
+        while True:
+            event = await read_message(reader)
+            if event is None:
+                raise ConnectionError("connection closed by the server")
+            if event["type"] == "result":
+                if not quiet:
+                    print(event["config"], event["count"], event["alpha"])
+            elif event["type"] == "done":
+                return event["log"]
+            else:
+                raise RuntimeError(event["message"])
+    finally:
+        writer.close()
+
+
+def main():
+    args = parse_args()
+    request = make_request(args)
+    try:
+        results = asyncio.run(submit(args.socket, request, args.quiet))
+    except (OSError, RuntimeError) as err:
+        print(f"error: {err}", file=sys.stderr)
+        sys.exit(1)
+
+    log = Log(args.log_file)
+    for conf, alphas in results:
+        log.add_entry(conf, alphas)
+    log.save()
+
+
+if __name__ == "__main__":
+    main()
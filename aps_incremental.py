@@ -0,0 +1,115 @@
+#! /usr/bin/python
+
+"""
+Update the alpha curves of a previous run of
+aps_loc_gls.py or aps_loc_one.py after the instance
+changed slightly (demand, facility locations), solving
+again only the facility counts that may have changed.
+"""
+
+from argparse import ArgumentParser
+
+from models import (
+    GendreauLaporteSemetInstance,
+    MyModelOneInstance,
+    incremental_alphas,
+    make_model,
+)
+from utils import (
+    Log,
+    add_solver_arguments,
+    check_solver_arguments,
+    load_instance,
+    load_json_file,
+    ReachIndex,
+    search_config,
+)
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("model", help="model of the log", choices=["gls", "one"])
+    parser.add_argument("old_instance", help="JSON instance of the previous run")
+    parser.add_argument("old_log", help="log of the previous run")
+    parser.add_argument("instance", help="JSON file containing the new instance")
+    parser.add_argument(
+        "log_file", help="Specify output log JSON file. If existing will be overwritten"
+    )
+    parser.add_argument(
+        "--old-solutions",
+        help="solutions file of the previous run (see --solutions-file), "
+        "used as hints and to bound the new alphas",
+        default=None,
+    )
+    parser.add_argument(
+        "--precision",
+        help="solve again the facility counts whose alpha interval is wider "
+        "than this. Default 0, every value that may have changed",
+        type=float,
+        default=0.0,
+    )
+    add_solver_arguments(parser)
+    parser.add_argument(
+        "--jobs",
+        help="specify the number of parallel jobs to run. Default 1",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--solutions-file",
+        help="Save the facility vectors of the new run to this JSON file",
+        default=None,
+    )
+    return check_solver_arguments(parser, parser.parse_args())
+
+
+def main():
+    args = parse_args()
+    kls = GendreauLaporteSemetInstance if args.model == "gls" else MyModelOneInstance
+    old_instance = load_instance(kls, args.old_instance)
+    instance = load_instance(kls, args.instance)
+    old_log = load_json_file(args.old_log)
+    old_solutions = {}
+    if args.old_solutions:
+        old_solutions = {
+            str(conf): sol for conf, sol in load_json_file(args.old_solutions)
+        }
+
+    search = search_config(args)
+    # values are exact only when every count is solved to the end
+    intervals = args.precision > 0 or search.anytime()
+    log = Log(args.log_file)
+    solution_log = Log(args.solutions_file)
+    old_index = ReachIndex(old_instance.distances)
+    reach_index = ReachIndex(instance.distances)
+    for conf, old_alphas in old_log:
+        old_model = make_model(
+            args.model, old_instance, conf, old_index, args.threads, args.backend
+        )
+        model = make_model(
+            args.model, instance, conf, reach_index, args.threads, args.backend
+        )
+        result = incremental_alphas(
+            model,
+            old_model,
+            old_alphas,
+            old_solutions.get(str(conf)),
+            len(model.facility_capacity()),
+            args.jobs,
+            search,
+            args.precision,
+        )
+        print(f"{conf}: solved again {len(result.solved)} facility counts")
+        if intervals:
+            log.add_entry(conf, result.intervals)
+        else:
+            log.add_entry(conf, [lower for lower, _ in result.intervals])
+        solution_log.add_entry(conf, result.solutions)
+
+    log.save()
+    if args.solutions_file:
+        solution_log.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,19 +4,17 @@
 Generate a sample instance 
 """
 
-import json
-import secrets
-import sys
-
-from matplotlib import pyplot as plt
-import numpy as np
+from argparse import ArgumentParser
 
 import generator as gen
+from generator import make_instance, make_location, make_radius
 
 
 
 
 def show_points(points, marker):
+    from matplotlib import pyplot as plt
+
     X = []
     Y = []
     for x, y in points:
@@ -25,67 +23,43 @@ def show_points(points, marker):
     plt.scatter(X, Y, marker=marker)
 
 
-def make_instance(lambda_coeff, distances):
-
-    distance = distances.tolist()
-    instance = {"lambda_coeff": lambda_coeff, "distances": distance}
-    return json.dumps(instance)
-
-
-def make_location(clients, stops):
-    clients = clients
-    stops = stops
-    locations = {"clients": clients, "stops": stops}
-    return json.dumps(locations)
-
-
-def round_distance(val, order):
-    val = np.round(val).astype(np.int32)
-    val -= val % order
-    return val
-
-
-def make_radius(distances, order):
-    distances = round_distance(distances, order)
-    count = {}
-    for row in distances:
-        for d in row:
-            try:
-                count[d] += 1
-            except KeyError:
-                count[d] = 1
-    count_list = list(count.items())
-    count_list.sort(key=lambda x: -x[1])
-    radius_list = [int(x) for x, _ in count_list if x]
-    radius_list.sort()
-    return json.dumps(radius_list)
-
-
 def show_instances(clients, stops):
+    from matplotlib import pyplot as plt
+
     show_points(clients, '.')
     show_points(stops, 'o')
     plt.show()
 
 
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("instance_file", help="output JSON instance file")
+    parser.add_argument("locations_file", help="output JSON locations file")
+    parser.add_argument("radius_file", help="output JSON radius list file")
+    parser.add_argument(
+        "--show", help="plot the clients and the stops", action="store_true"
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     client_conf = gen.ClientConfig(15, 150, 500, 2500)
     stop_conf = gen.StopConfiguration(20, 150, 1500, 1500)
     rnd_instance = gen.build_random_instance(stop_conf, client_conf)
 
-    show_instances(rnd_instance.clients, rnd_instance.stops)
+    if args.show:
+        show_instances(rnd_instance.clients, rnd_instance.stops)
 
     radius_list = make_radius(rnd_instance.distances, 5000)
     instance = make_instance(rnd_instance.lambda_coeff, rnd_instance.distances)
     locations = make_location(rnd_instance.clients, rnd_instance.stops)
-    try:
-        with open(sys.argv[1], "w") as file:
-            print(instance, file=file)
-        with open(sys.argv[2], "w") as file:
-            print(locations, file=file)
-        with open(sys.argv[3], "w") as file:
-            print(radius_list, file=file)
-    except IndexError:
-        print(instance)
+    with open(args.instance_file, "w") as file:
+        print(instance, file=file)
+    with open(args.locations_file, "w") as file:
+        print(locations, file=file)
+    with open(args.radius_file, "w") as file:
+        print(radius_list, file=file)
 
 
 if __name__ == "__main__":
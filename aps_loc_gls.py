@@ -3,57 +3,168 @@
 """
 Implement the Double Coverage Problem
 with the model describe in:
-    'Solving an Ambulance Location Model by Tabu Search' 
+    'Solving an Ambulance Location Model by Tabu Search'
         by Gendreau, Laporte and Semet.
-In this script the problem is solved exactly using Gurobi.
+In this script the problem is solved exactly using Gurobi
+or HiGHS (see --backend).
 """
 
-from dataclasses import dataclass
-
-import numpy as np
-
 from models import (
     Model,
     GendreauLaporteSemetModel,
+    GendreauLaporteSemetInstance,
     ModelConfig,
     find_max_alpha_by_facilities,
+    find_max_alpha_by_components,
+    find_alpha_bounds_by_facilities,
+    coarse_to_fine,
+    find_scenario_alphas_by_facilities,
 )
 from utils import (
     Log,
+    Trace,
     parse_args,
     load_instance,
     load_json_file,
+    ReachIndex,
+    search_config,
 )
 
 
-@dataclass
-class Instance:
-    demand: np.ndarray
-    distances: np.ndarray
-    locations: np.ndarray
-
-
 def load_config(file_name):
     config = load_json_file(file_name)
     configs = [ModelConfig(r1, r2) for r1, r2 in config]
     return configs
 
 
+def add_arguments(parser):
+    parser.add_argument(
+        "--approximate",
+        help="do not run the solver: log the alpha reached by the Lagrangian "
+        "heuristic, a lower bound of the exact value",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--coarse",
+        help="merge demand points whose distances are within this tolerance, "
+        "bound alpha on the merged models and solve exactly only the facility "
+        "counts needed by --alpha-range and --precision",
+        type=float,
+        default=None,
+    )
+    parser.add_argument(
+        "--alpha-range",
+        help="with --coarse, alpha interval of interest. Default 0.4 0.95",
+        type=float,
+        nargs=2,
+        default=(0.4, 0.95),
+    )
+    parser.add_argument(
+        "--precision",
+        help="with --coarse, accepted width of the alpha bounds. Default 0.01",
+        type=float,
+        default=0.01,
+    )
+    parser.add_argument(
+        "--scenarios",
+        help="JSON matrix of demand scenarios (one row of demand weights for "
+        "each scenario): log the robust alpha, reached in every scenario by "
+        "the same facilities. Search options are ignored",
+        default=None,
+    )
+    parser.add_argument(
+        "--scenario-log",
+        help="with --scenarios, save the curve of each scenario and their "
+        "pointwise minimum (configuration 'worst') to this log file",
+        default=None,
+    )
+    parser.add_argument(
+        "--upper-log",
+        help="with --approximate or --coarse, save the upper bounds to this log file",
+        default=None,
+    )
+
+
 def main():
     """ """
-    args = parse_args()
-    instance = load_instance(Instance, args.instance)
+    args = parse_args(add_arguments)
+    instance = load_instance(GendreauLaporteSemetInstance, args.instance)
     config = load_config(args.config)
 
+    search = search_config(args)
+    anytime = search.anytime()
     log = Log(args.log_file)
+    upper_log = Log(args.upper_log)
+    trace = Trace(args.trace_file)
+    solution_log = Log(args.solutions_file)
+    scenario_log = Log(args.scenario_log)
+    scenarios = load_json_file(args.scenarios) if args.scenarios else None
+    reach_index = ReachIndex(instance.distances)
     for conf in config:
         model = GendreauLaporteSemetModel(
-            instance.demand, conf, instance.distances, instance.locations, args.threads
-        ).setup()
-        alpha = find_max_alpha_by_facilities(model, len(instance.locations), args.jobs)
-        log.add_entry((conf.radius_small, conf.radius_large), alpha)
+            instance.demand,
+            conf,
+            instance.distances,
+            instance.locations,
+            args.threads,
+            args.backend,
+        ).setup(reach_index)
+        probes = [] if args.trace_file else None
+        solutions = [] if args.solutions_file else None
+        if args.approximate:
+            alpha, upper = find_alpha_bounds_by_facilities(
+                model, len(instance.locations), args.jobs
+            )
+            upper_log.add_entry((conf.radius_small, conf.radius_large), upper)
+        elif args.coarse is not None:
+            curve = coarse_to_fine(
+                model,
+                len(instance.locations),
+                args.jobs,
+                args.coarse,
+                args.alpha_range,
+                args.precision,
+                search,
+            )
+            alpha = curve.lower
+            upper_log.add_entry((conf.radius_small, conf.radius_large), curve.upper)
+        elif scenarios is not None:
+            curves = find_scenario_alphas_by_facilities(
+                model, scenarios, len(instance.locations), args.jobs
+            )
+            alpha = curves.robust
+            radii = (conf.radius_small, conf.radius_large)
+            for s, curve in enumerate(curves.alphas):
+                scenario_log.add_entry((*radii, s), curve)
+            scenario_log.add_entry((*radii, "worst"), curves.worst)
+        elif args.decompose:
+            alpha = find_max_alpha_by_components(
+                model, len(instance.locations), args.jobs
+            )
+        else:
+            alpha = find_max_alpha_by_facilities(
+                model,
+                len(instance.locations),
+                args.jobs,
+                probes,
+                search,
+                anytime,
+                solutions,
+            )
+        radii = (conf.radius_small, conf.radius_large)
+        log.add_entry(radii, alpha)
+        trace.add_entries(radii, probes)
+        if solutions is not None:
+            solution_log.add_entry(radii, solutions)
 
     log.save()
+    if args.upper_log:
+        upper_log.save()
+    if args.solutions_file:
+        solution_log.save()
+    if args.scenario_log:
+        scenario_log.save()
+    trace.save()
 
 
 if __name__ == "__main__":
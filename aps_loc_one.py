@@ -6,16 +6,20 @@ import numpy as np
 from models import (
     Model,
     MyModelOne,
+    MyModelOneBenders,
     ModelConfig,
     MyModelOneInstance,
     find_max_alpha_by_facilities,
+    find_max_alpha_by_components,
 )
 from utils import (
     Log,
+    Trace,
     parse_args,
     load_instance,
-    compute_reach_coefficent,
+    ReachIndex,
     load_json_file,
+    search_config,
 )
 
 
@@ -24,24 +28,62 @@ def load_config(file_name):
     return config
 
 
+def add_arguments(parser):
+    parser.add_argument(
+        "--benders",
+        help="solve the Benders decomposition of the model: the assignment "
+        "variables are replaced by coverage cuts added lazily",
+        action="store_true",
+    )
+
+
 def main():
     """ """
-    args = parse_args()
+    args = parse_args(add_arguments)
+    kls = MyModelOneBenders if args.benders else MyModelOne
     instance = load_instance(MyModelOneInstance, args.instance)
     config = load_config(args.config)
 
+    search = search_config(args)
+    anytime = search.anytime()
     log = Log(args.log_file)
+    trace = Trace(args.trace_file)
+    solution_log = Log(args.solutions_file)
+    reach_index = ReachIndex(instance.distances)
     for conf in config:
-        delta_coeff = compute_reach_coefficent(instance.distances, conf)
-        model = MyModelOne(
-            instance.distances, instance.lambda_coeff, delta_coeff, args.threads
-        )
-        alpha = find_max_alpha_by_facilities(
-            model, len(instance.lambda_coeff), args.jobs
+        delta_coeff = reach_index.reach(conf)
+        model = kls(
+            instance.distances,
+            instance.lambda_coeff,
+            delta_coeff,
+            args.threads,
+            args.backend,
         )
+        probes = [] if args.trace_file else None
+        solutions = [] if args.solutions_file else None
+        if args.decompose:
+            alpha = find_max_alpha_by_components(
+                model, len(instance.lambda_coeff), args.jobs
+            )
+        else:
+            alpha = find_max_alpha_by_facilities(
+                model,
+                len(instance.lambda_coeff),
+                args.jobs,
+                probes,
+                search,
+                anytime,
+                solutions,
+            )
         log.add_entry(conf, alpha)
+        trace.add_entries(conf, probes)
+        if solutions is not None:
+            solution_log.add_entry(conf, solutions)
 
     log.save()
+    if args.solutions_file:
+        solution_log.save()
+    trace.save()
 
 
 if __name__ == "__main__":
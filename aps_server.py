@@ -0,0 +1,47 @@
+#! /usr/bin/python
+
+"""
+Start the local solve service.
+Jobs are submitted with aps_client.py.
+"""
+
+from argparse import ArgumentParser
+import asyncio
+
+from service.protocol import DEFAULT_SOCKET
+from service.server import Server
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--socket",
+        help=f"Unix socket to listen on. Default {DEFAULT_SOCKET}",
+        default=DEFAULT_SOCKET,
+    )
+    parser.add_argument(
+        "--jobs",
+        help="specify the number of worker processes. Default 1",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--completed",
+        help="number of completed jobs whose results are kept. Default 256",
+        type=int,
+        default=256,
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    server = Server(args.socket, args.jobs, args.completed)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -6,3 +6,5 @@ from .gen_instance import (
     StopConfiguration,
     build_random_instance,
 )
+from .serialize import make_instance, make_location, make_radius
+from .family import FamilyGrid, InstanceSpec, generate_family
@@ -0,0 +1,127 @@
+#! /usr/bin/python
+
+"""
+Generate a family of random instances from a
+parameter grid. Every instance has its own random
+stream, derived from the grid seed and the instance index,
+so any instance can be reproduced on its own.
+"""
+
+from dataclasses import dataclass, asdict
+import itertools
+import json
+from multiprocessing import Pool
+import os
+
+import numpy as np
+
+from .gen_instance import ClientConfig, StopConfiguration, build_random_instance
+from .serialize import make_instance, make_location, make_radius
+
+
+@dataclass
+class FamilyGrid:
+    """
+    Every combination of stops, clients and replica
+    produces one instance.
+    """
+
+    stops: [StopConfiguration]
+    clients: [ClientConfig]
+    replicas: int = 1
+    seed: int = 0
+    radius_order: int = 5000
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            [StopConfiguration(**s) for s in data["stops"]],
+            [ClientConfig(**c) for c in data["clients"]],
+            data.get("replicas", 1),
+            data.get("seed", 0),
+            data.get("radius_order", 5000),
+        )
+
+    def specs(self):
+        combinations = itertools.product(self.stops, self.clients, range(self.replicas))
+        for index, (stop_conf, client_conf, replica) in enumerate(combinations):
+            name = f"instance-{index:04d}"
+            yield InstanceSpec(
+                name,
+                stop_conf,
+                client_conf,
+                replica,
+                self.seed,
+                index,
+                self.radius_order,
+            )
+
+
+@dataclass
+class InstanceSpec:
+    name: str
+    stops: StopConfiguration
+    clients: ClientConfig
+    replica: int
+    seed: int
+    stream: int
+    radius_order: int
+
+    def rng(self):
+        """
+        Independent stream: the stream-th child
+        of the seed sequence of the family.
+        """
+        seed_seq = np.random.SeedSequence(self.seed, spawn_key=(self.stream,))
+        return np.random.default_rng(seed_seq)
+
+    def files(self, output_dir):
+        return {
+            kind: os.path.join(output_dir, f"{self.name}-{kind}.json")
+            for kind in ("instance", "locations", "radius")
+        }
+
+
+@dataclass
+class FamilyTask:
+    output_dir: str
+
+    def __call__(self, spec: InstanceSpec):
+        rnd_instance = build_random_instance(spec.stops, spec.clients, spec.rng())
+        contents = {
+            "instance": make_instance(
+                rnd_instance.lambda_coeff, rnd_instance.distances
+            ),
+            "locations": make_location(rnd_instance.clients, rnd_instance.stops),
+            "radius": make_radius(rnd_instance.distances, spec.radius_order),
+        }
+        files = spec.files(self.output_dir)
+        for kind, content in contents.items():
+            with open(files[kind], "w") as file:
+                print(content, file=file)
+
+        entry = asdict(spec)
+        entry["files"] = {k: os.path.basename(f) for k, f in files.items()}
+        entry["client_count"] = len(rnd_instance.clients)
+        entry["stop_count"] = len(rnd_instance.stops)
+        return entry
+
+
+def generate_family(grid: FamilyGrid, output_dir: str, jobs: int):
+    """
+    Write every instance of the grid in output_dir,
+    with a manifest.json file describing them.
+    Return the manifest.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with Pool(jobs) as pool:
+        entries = pool.map(FamilyTask(output_dir), grid.specs(), chunksize=1)
+
+    manifest = {
+        "seed": grid.seed,
+        "radius_order": grid.radius_order,
+        "instances": entries,
+    }
+    with open(os.path.join(output_dir, "manifest.json"), "w") as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
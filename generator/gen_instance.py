@@ -1,7 +1,10 @@
 #! /usr/bin/python
 
 """
-
+Random instances: stops are placed along a line,
+clients are normally distributed around each stop.
+Every function takes an optional numpy Generator,
+so instances can be reproduced from a seed.
 """
 
 from dataclasses import dataclass
@@ -17,12 +20,19 @@ class RandomInstance:
     lambda_coeff: [float]
 
 
-def make_clients(station, count, scale):
+def get_rng(rng):
+    if rng is None:
+        return np.random.default_rng()
+    return rng
+
+
+def make_clients(station, count, scale, rng=None):
+    rng = get_rng(rng)
     sx, sy = station
     points = set()
     while len(points) < count:
-        x = (np.random.normal() * scale) + sx
-        y = (np.random.normal() * scale) + sy
+        x = (rng.normal() * scale) + sx
+        y = (rng.normal() * scale) + sy
         points.add((x, y))
     return list(points)
 
@@ -36,11 +46,11 @@ def distance(p1, p2):
 
 
 def build_distance_matrix(clients, stations):
-    output = np.zeros((len(clients), len(stations)))
-    for i, c in enumerate(clients):
-        for j, s in enumerate(stations):
-            output[i, j] = distance(c, s)
-    return output
+    clients = np.asarray(clients, dtype=float).reshape(-1, 2)
+    stations = np.asarray(stations, dtype=float).reshape(-1, 2)
+    delta = clients[:, np.newaxis, :] - stations[np.newaxis, :, :]
+    return np.sqrt((delta**2).sum(axis=2))
+
 
 @dataclass
 class StopConfiguration:
@@ -50,16 +60,18 @@ class StopConfiguration:
     distance: int
 
 
-def gen_stops(sc: StopConfiguration):
+def gen_stops(sc: StopConfiguration, rng=None):
+    rng = get_rng(rng)
     stops = []
     x = 0
     while len(stops) < sc.count:
-        y = x + np.random.randint(-sc.delta_y, sc.delta_y)
-        x_tmp = x + np.random.randint(-sc.delta_x, sc.delta_x)
+        y = x + int(rng.integers(-sc.delta_y, sc.delta_y))
+        x_tmp = x + int(rng.integers(-sc.delta_x, sc.delta_x))
         stops.append((x_tmp, y))
         x += sc.distance
     return stops
 
+
 @dataclass
 class ClientConfig:
     min_count: int
@@ -68,22 +80,25 @@ class ClientConfig:
     max_scale: int
 
 
-def gen_client(cc: ClientConfig, stops):
-
+def gen_client(cc: ClientConfig, stops, rng=None):
+    rng = get_rng(rng)
     clients = []
     lambda_coeff = []
     for s in stops:
-        amt = np.random.randint(cc.min_count, cc.max_count)
+        amt = int(rng.integers(cc.min_count, cc.max_count))
         lambda_coeff.append(amt)
-        scale = np.random.randint(cc.min_scale, cc.max_scale)
-        tmp = make_clients(s, amt, scale)
+        scale = int(rng.integers(cc.min_scale, cc.max_scale))
+        tmp = make_clients(s, amt, scale, rng)
         clients += tmp
 
     return clients, lambda_coeff
 
 
-def build_random_instance(stop_conf: StopConfiguration, client_conf: ClientConfig):
-    stops = gen_stops(stop_conf)
-    clients, lambda_coeff = gen_client(client_conf, stops)
+def build_random_instance(
+    stop_conf: StopConfiguration, client_conf: ClientConfig, rng=None
+):
+    rng = get_rng(rng)
+    stops = gen_stops(stop_conf, rng)
+    clients, lambda_coeff = gen_client(client_conf, stops, rng)
     distances = build_distance_matrix(clients, stops)
     return RandomInstance(stops, clients, distances, lambda_coeff)
@@ -0,0 +1,39 @@
+#! /usr/bin/python
+
+"""
+JSON encoding of random instances:
+the model instance, the locations
+(used by the plot scripts) and the radius list.
+"""
+
+import json
+
+import numpy as np
+
+
+def make_instance(lambda_coeff, distances):
+
+    distance = np.asarray(distances).tolist()
+    instance = {"lambda_coeff": lambda_coeff, "distances": distance}
+    return json.dumps(instance)
+
+
+def make_location(clients, stops):
+    locations = {"clients": clients, "stops": stops}
+    return json.dumps(locations)
+
+
+def round_distance(val, order):
+    val = np.round(val).astype(np.int32)
+    val -= val % order
+    return val
+
+
+def make_radius(distances, order):
+    """
+    Sorted list of the distinct, non zero,
+    distances rounded to order.
+    """
+    distances = round_distance(np.asarray(distances), order)
+    radius_list = [int(x) for x in np.unique(distances) if x]
+    return json.dumps(radius_list)
@@ -0,0 +1,50 @@
+#! /usr/bin/python
+
+"""
+Generate, in parallel, a reproducible family of
+instances (with location and radius files) from
+a JSON parameter grid:
+{
+    "stops": [{"count": 20, "delta_x": 150, "delta_y": 1500, "distance": 1500}],
+    "clients": [{"min_count": 15, "max_count": 150, "min_scale": 500, "max_scale": 2500}],
+    "replicas": 5,
+    "seed": 1234,
+    "radius_order": 5000
+}
+"""
+
+from argparse import ArgumentParser
+
+from generator import FamilyGrid, generate_family
+from utils import load_json_file
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("grid", help="JSON file containing the parameter grid")
+    parser.add_argument(
+        "output_dir", help="Output directory. Existing files will be overwritten"
+    )
+    parser.add_argument(
+        "--jobs",
+        help="specify the number of parallel jobs to run. Default 1",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--seed", help="override the seed in the grid file", type=int, default=None
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    grid = FamilyGrid.from_dict(load_json_file(args.grid))
+    if args.seed is not None:
+        grid.seed = args.seed
+    manifest = generate_family(grid, args.output_dir, args.jobs)
+    print(f"{len(manifest['instances'])} instances written to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,25 @@
 #! /usr/bin/python
 
-from .find_max_alpha import find_max_alpha_by_facilities
+from .find_max_alpha import (
+    find_max_alpha_by_facilities,
+    search_max_alpha,
+    SearchConfig,
+    PoolCallback,
+)
+from .decomposition import find_max_alpha_by_components
+from .lagrangian import find_alpha_bounds_by_facilities
+from .aggregation import coarse_to_fine
+from .incremental import incremental_alphas
+from .scenarios import find_scenario_alphas_by_facilities
+from .tuning import ProbeProfile, load_profile, curve_samples, candidate_params, tune
+from .factory import make_model
 
 from .abstract_model import Model
-from .model_GLS import ModelConfig, GendreauLaporteSemetModel
+from .model_GLS import (
+    ModelConfig,
+    GendreauLaporteSemetModel,
+    GendreauLaporteSemetInstance,
+)
 from .my_model_1 import MyModelOne, MyModelOneInstance
+from .benders import MyModelOneBenders
 from .model_best_couple import FindBestCoupling
@@ -1,9 +1,13 @@
 #! /usr/bin/python
 
-import gurobipy as gp
+from .backend import make_backend, row, Status
 
 
 class Model:
+    isolated = False
+    # lazy constraints, see Backend.optimize
+    lazy = None
+
     def get_vars(self):
         raise NotImplementedError()
 
@@ -13,16 +17,160 @@ class Model:
     def build_model(self, count: int, alpha: float):
         pass
 
-    def is_fesible(self):
+    def alpha_levels(self):
+        """
+        Sorted sequence of the alpha values the model
+        can achieve, or None if they are not known.
+        """
+        return None
+
+    def alpha_bounds(self, count: int):
+        """
+        Cheap (lower, upper, facilities) bounds on the maximal
+        alpha with count facilities: lower is achieved by the
+        facility vector, None if unknown, and no alpha above upper
+        is feasible. Return None if the model has no bounds.
+        """
+        return None
+
+    def solution_alpha(self, facilities):
+        """
+        Alpha reached by a facility vector, None if the
+        vector is not feasible or the model cannot tell.
+        """
+        return None
+
+    def facility_block(self):
+        """
+        Variable block that describes where
+        facilities are opened.
+        """
+        raise NotImplementedError()
+
+    def get_facilities(self):
+        return self.values(self.facility_block())
+
+    def set_start(self, facilities, hint: bool = False):
+        """
+        Give a facility vector to the solver as MIP start
+        or, if hint is set, as variable hint.
+        """
+        if hint:
+            self.model.set_hint(self.facility_block(), facilities)
+        else:
+            self.model.set_start(self.facility_block(), facilities)
 
-        self.model.setParam("SolutionLimit", 1)
-        self.model.setParam("LogToConsole", 0)
-        self.model.optimize()
-        return (
-            self.model.status == gp.GRB.OPTIMAL
-            or self.model.status == gp.GRB.SOLUTION_LIMIT
+    def coverage_block(self):
+        """
+        Variable block of the covered demand
+        points, the ones counted by alpha.
+        """
+        raise NotImplementedError()
+
+    def demand_weights(self):
+        """
+        Weight of each demand point in alpha
+        """
+        raise NotImplementedError()
+
+    def facility_capacity(self):
+        """
+        Maximal number of facilities in each location
+        """
+        raise NotImplementedError()
+
+    def coverage_graph(self):
+        """
+        Demand points x facility locations matrix.
+        Demand points and locations in different connected
+        components of this bipartite graph are independent.
+        """
+        raise NotImplementedError()
+
+    def restrict(self, demand_index, facility_index):
+        """
+        Return the same model on the sub-instance made by
+        the given demand points and facility locations.
+        """
+        raise NotImplementedError()
+
+    def aggregate(self, tolerance: float):
+        """
+        Return two smaller models where demand points with
+        similar distances (within tolerance) are merged: the
+        maximal alpha of the first one is a lower bound for
+        this model, the one of the second an upper bound.
+        """
+        raise NotImplementedError()
+
+    def max_coverage(self, count: int):
+        """
+        Maximal covered demand weight with exactly count
+        facilities, None if the model is infeasible.
+        """
+        self.build_model(count, 0.0)
+        self.model.set_objective(
+            [(row(self.demand_weights()), self.coverage_block())], True
         )
+        # the value is used as is: no optimality gap
+        self.model.set_param("MIPGap", 0)
+        self.model.set_param("LogToConsole", 0)
+        if self.model.optimize(lazy=self.lazy) != Status.OPTIMAL:
+            return None
+        return float(self.demand_weights() @ self.values(self.coverage_block()))
+
+    def new_model(self, threads: int):
+        """
+        Create an empty model on the
+        backend selected for this instance.
+        """
+        self.model = make_backend(self.backend, threads, self.isolated)
+
+    def set_time_limit(self, seconds: float):
+        self.model.set_param("TimeLimit", seconds)
+
+    def set_params(self, params: dict):
+        for name, value in params.items():
+            self.model.set_param(name, value)
+
+    def is_fesible(self):
+        """
+        None if the solver stopped on the time
+        limit before deciding feasibility
+        """
+        status = self.model.optimize(feasibility=True, lazy=self.lazy)
+        if status == Status.TIME_LIMIT:
+            return None
+        return status.feasible
 
     def solve(self):
-        self.model.optimize()
+        self.model.optimize(lazy=self.lazy)
         return self.model
+
+    def terminate(self):
+        try:
+            self.model.terminate()
+        except AttributeError:
+            # model not built yet
+            pass
+
+    def dispose(self):
+        """
+        Free the solver resources: the model
+        must be built again before solving
+        """
+        try:
+            self.model.dispose()
+        except AttributeError:
+            # model not built yet
+            pass
+
+    def values(self, block, index=None):
+        return self.model.values(block, index)
+
+    def probe_stats(self):
+        """
+        Return the solver statistics of the
+        last optimization.
+        """
+        return self.model.stats()
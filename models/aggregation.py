@@ -0,0 +1,115 @@
+#! /usr/bin/python
+
+"""
+Coarse to fine alpha curves. Demand points whose distances
+to every facility location fall in the same bins of width
+tolerance are merged into weighted super points. Taking, for
+each location, the largest distance in the group gives a model
+whose points are reached only when all the members are (a lower
+bound on alpha), the smallest distance gives an upper bound.
+Only the facility counts whose interval matters are solved exactly.
+"""
+
+from dataclasses import dataclass
+from multiprocessing import Pool
+
+import numpy as np
+
+from .abstract_model import Model
+from .find_max_alpha import (
+    search_max_alpha,
+    find_max_alpha_by_facilities,
+    SearchConfig,
+)
+
+
+def group_points(distances: np.ndarray, tolerance: float, horizon: float):
+    """
+    Label each row of distances with its group: rows are in the
+    same group when their distances are in the same bins of width
+    tolerance. Distances beyond horizon are all in the same bin.
+    """
+    bins = np.floor(np.minimum(distances, horizon) / tolerance).astype(np.int64)
+    _, labels = np.unique(bins, axis=0, return_inverse=True)
+    return labels.ravel()
+
+
+def group_reduce(values: np.ndarray, labels: np.ndarray, ufunc):
+    """
+    Reduce the rows of values with the same label
+    with ufunc, one output row for each label
+    """
+    order = np.argsort(labels, kind="stable")
+    starts = np.flatnonzero(np.diff(labels[order], prepend=-1))
+    return ufunc.reduceat(values[order], starts, axis=0)
+
+
+@dataclass
+class CoarseCurve:
+    """
+    For each facility count, an interval [lower, upper]
+    containing the maximal alpha
+    """
+
+    lower: list
+    upper: list
+    # facility counts solved on the original model
+    refined: list
+
+
+@dataclass
+class RefineCallback:
+    model: Model
+    search: object
+    brackets: dict
+
+    def callback(self, count):
+        bracket = self.brackets[count]
+        return search_max_alpha(self.model, count, self.search, bracket=bracket).alpha
+
+
+def coarse_to_fine(
+    model: Model,
+    facility_max_count: int,
+    jobs: int,
+    tolerance: float,
+    alpha_range=(0.4, 0.95),
+    precision: float = 0.01,
+    search=None,
+):
+    """
+    Compute the alpha curve on the aggregated models
+    (see Model.aggregate), then solve the original model
+    for the facility counts whose interval is wider than
+    precision and overlaps alpha_range.
+    """
+    if search is None:
+        search = SearchConfig()
+    lower_model, upper_model = model.aggregate(tolerance)
+    lower = find_max_alpha_by_facilities(
+        lower_model, facility_max_count, jobs, None, search
+    )
+    upper = find_max_alpha_by_facilities(
+        upper_model, facility_max_count, jobs, None, search
+    )
+    if not search.discrete:
+        # the continuous search may stop up to tol below the maximum
+        upper = [min(1.0, alpha + search.tol) for alpha in upper]
+    upper = [max(lo, up) for lo, up in zip(lower, upper)]
+
+    low, high = alpha_range
+    brackets = {
+        i + 1: (lo, up)
+        for i, (lo, up) in enumerate(zip(lower, upper))
+        if up - lo > precision and up >= low and lo <= high
+    }
+    refined = sorted(brackets)
+    if refined:
+        cb = RefineCallback(model, search, brackets)
+        with Pool(jobs) as pool:
+            exact = pool.map(cb.callback, refined, chunksize=1)
+        width = 0.0 if search.discrete else search.tol
+        for count, alpha in zip(refined, exact):
+            lower[count - 1] = alpha
+            upper[count - 1] = min(1.0, alpha + width)
+    return CoarseCurve(lower, upper, refined)
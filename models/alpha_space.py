@@ -0,0 +1,134 @@
+#! /usr/bin/python
+
+"""
+Search spaces for the alpha search.
+The search keeps an interval of positions [lower, upper]:
+lower is feasible, upper is infeasible (or out of range).
+A continuous space searches alpha itself up to a tolerance.
+A discrete space searches the index of a sorted sequence
+of achievable alpha values, so the result is exact.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class ContinuousSpace:
+    tol: float
+
+    lower = 0.0
+    upper = 1.0
+
+    def done(self, lower, upper):
+        return upper - lower <= self.tol
+
+    def points(self, lower, upper, count: int):
+        step = (upper - lower) / (count + 1)
+        return [lower + step * (i + 1) for i in range(count)]
+
+    def alpha(self, position):
+        return position
+
+    def above(self, position):
+        """
+        Closest position above that ends
+        the search if it is infeasible
+        """
+        return position + self.tol
+
+    def upper_bound(self, upper):
+        """
+        Largest alpha that may be feasible
+        when upper is infeasible
+        """
+        return min(upper, 1.0)
+
+    def bracket(self, lower, upper):
+        """
+        Positions for a feasible alpha lower
+        (None if unknown) and an alpha upper
+        above which nothing is feasible
+        """
+        lower = self.lower if lower is None else lower
+        return lower, max(lower, min(self.upper, upper))
+
+
+@dataclass
+class DiscreteSpace:
+    levels: object
+
+    lower = 0
+
+    @property
+    def upper(self):
+        # one past the last level: the last one is probed too
+        return len(self.levels)
+
+    def done(self, lower, upper):
+        return upper - lower <= 1
+
+    def points(self, lower, upper, count: int):
+        step = (upper - lower) / (count + 1)
+        points = {lower + max(1, round(step * (i + 1))) for i in range(count)}
+        return sorted(p for p in points if lower < p < upper)
+
+    def alpha(self, position):
+        return float(self.levels[position])
+
+    def above(self, position):
+        return position + 1
+
+    def upper_bound(self, upper):
+        # only levels can be achieved
+        return self.alpha(max(upper - 1, 0))
+
+    def bracket(self, lower, upper):
+        # bounds are moved inward by a relative tolerance:
+        # they may differ from the levels by rounding
+        output = self.lower
+        if lower is not None:
+            output = max(output, bisect_right(self.levels, lower * (1 - 1e-9)) - 1)
+        upper = bisect_right(self.levels, upper * (1 + 1e-9) + 1e-12)
+        return output, max(output, upper)
+
+
+@dataclass
+class UniformLevels:
+    """
+    The alpha values k / count for k in 0..count,
+    without storing them
+    """
+
+    count: int
+
+    def __len__(self):
+        return self.count + 1
+
+    def __getitem__(self, k):
+        return k / self.count
+
+
+def subset_sum_levels(weights: np.ndarray, max_levels: int = 1 << 16):
+    """
+    Sorted alpha values that can be obtained as
+    the sum of a subset of weights over the total.
+    When weights are integer any integer sum is used:
+    it is a superset of the achievable values, so
+    the search is still exact.
+    Return None if there are more than max_levels values.
+    """
+    total = weights.sum()
+    if total <= 0:
+        return None
+    if np.all(weights == np.round(weights)):
+        return UniformLevels(int(round(total)))
+
+    sums = np.zeros(1)
+    for w in weights:
+        sums = np.unique(np.concatenate((sums, sums + w)))
+        if len(sums) > max_levels:
+            return None
+    return sums / total
@@ -0,0 +1,33 @@
+#! /usr/bin/python
+
+"""
+Solver backends. Models are written against the
+Backend interface, so the same model definition
+can be solved either with Gurobi or with HiGHS
+(through scipy.optimize.milp).
+Backends are imported lazily: gurobipy is required
+only when the Gurobi backend is actually used.
+"""
+
+from .base import Backend, Status, VarBlock, ConstrBlock, row, eye
+
+BACKENDS = ("gurobi", "highs")
+# backends whose optimize can be stopped by terminate
+CANCELLABLE = ("gurobi",)
+
+
+def make_backend(name: str, threads: int = 0, isolated: bool = False) -> Backend:
+    """
+    isolated models do not share any solver state
+    with other models and can be solved concurrently
+    from different threads.
+    """
+    if name == "gurobi":
+        from .gurobi_backend import GurobiBackend
+
+        return GurobiBackend(threads, isolated)
+    if name == "highs":
+        from .highs_backend import HighsBackend
+
+        return HighsBackend(threads)
+    raise ValueError(f"unknown backend '{name}'. Available: {', '.join(BACKENDS)}")
@@ -0,0 +1,139 @@
+#! /usr/bin/python
+
+"""
+Common interface shared by every solver backend.
+Variables are created in blocks and constraints
+are given in matrix form: a list of (coefficients, block)
+terms, where coefficients is a (sparse) matrix with one
+row per constraint and one column per variable in the block.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class Status(Enum):
+    OPTIMAL = "optimal"
+    SOLUTION_LIMIT = "solution_limit"
+    INFEASIBLE = "infeasible"
+    UNBOUNDED = "unbounded"
+    TIME_LIMIT = "time_limit"
+    INTERRUPTED = "interrupted"
+    OTHER = "other"
+
+    @property
+    def feasible(self):
+        return self in (Status.OPTIMAL, Status.SOLUTION_LIMIT)
+
+
+@dataclass(frozen=True)
+class VarBlock:
+    start: int
+    count: int
+    handle: object = None
+
+
+@dataclass(frozen=True)
+class ConstrBlock:
+    start: int
+    count: int
+    handle: object = None
+
+
+def row(values) -> sp.csr_matrix:
+    """
+    Coefficient matrix of a single
+    constraint from a vector
+    """
+    return sp.csr_matrix(np.asarray(values, dtype=float).reshape(1, -1))
+
+
+def eye(count: int) -> sp.csr_matrix:
+    return sp.identity(count, format="csr")
+
+
+class Backend:
+    # variable types
+    BINARY = "B"
+    INTEGER = "I"
+    CONTINUOUS = "C"
+
+    def add_vars(self, count: int, vtype: str, ub=None, name: str = "") -> VarBlock:
+        raise NotImplementedError()
+
+    def add_constrs(self, terms, sense: str, rhs) -> ConstrBlock:
+        """
+        Add the constraints
+            sum(coeff @ block for coeff, block in terms) <sense> rhs
+        sense is one of '<', '>' or '='.
+        """
+        raise NotImplementedError()
+
+    def set_rhs(self, block: ConstrBlock, rhs):
+        """
+        Change the right hand side of a constraint
+        block, keeping its coefficients and sense
+        """
+        raise NotImplementedError()
+
+    def set_objective(self, terms, maximize: bool):
+        raise NotImplementedError()
+
+    def set_param(self, name: str, value):
+        raise NotImplementedError()
+
+    def set_start(self, block: VarBlock, values):
+        """
+        Give a (partial) MIP start. Backends
+        that do not support it ignore it.
+        """
+        pass
+
+    def set_hint(self, block: VarBlock, values):
+        """
+        Give a hint on the values of the variables.
+        Backends that do not support it ignore it.
+        """
+        pass
+
+    def optimize(self, feasibility: bool = False, lazy=None) -> Status:
+        """
+        Solve the model. When feasibility is True
+        the backend stops at the first feasible solution.
+        lazy, if given, is called on each candidate solution
+        with a function returning the values of a block, and
+        returns the list of (terms, sense, rhs) constraints
+        to add: an empty list accepts the solution.
+        """
+        raise NotImplementedError()
+
+    def terminate(self):
+        """
+        Ask a running optimization, started
+        from another thread, to stop.
+        """
+        pass
+
+    def dispose(self):
+        """
+        Free the solver resources. The
+        model cannot be used afterwards.
+        """
+        pass
+
+    def values(self, block: VarBlock, index=None) -> np.ndarray:
+        """
+        Bulk query of the solution values of block,
+        or of its variables at positions index only.
+        """
+        raise NotImplementedError()
+
+    def stats(self) -> dict:
+        """
+        Statistics of the last optimization:
+        runtime, node_count, mip_gap, status, num_vars, num_constrs
+        """
+        raise NotImplementedError()
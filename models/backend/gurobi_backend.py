@@ -0,0 +1,166 @@
+#! /usr/bin/python
+
+import numpy as np
+import scipy.sparse as sp
+import gurobipy as gp
+
+from .base import Backend, Status, VarBlock, ConstrBlock
+
+STATUS = {
+    gp.GRB.OPTIMAL: Status.OPTIMAL,
+    gp.GRB.SOLUTION_LIMIT: Status.SOLUTION_LIMIT,
+    gp.GRB.INFEASIBLE: Status.INFEASIBLE,
+    gp.GRB.INF_OR_UNBD: Status.INFEASIBLE,
+    gp.GRB.UNBOUNDED: Status.UNBOUNDED,
+    gp.GRB.TIME_LIMIT: Status.TIME_LIMIT,
+    gp.GRB.INTERRUPTED: Status.INTERRUPTED,
+}
+
+VTYPE = {
+    Backend.BINARY: gp.GRB.BINARY,
+    Backend.INTEGER: gp.GRB.INTEGER,
+    Backend.CONTINUOUS: gp.GRB.CONTINUOUS,
+}
+
+
+class GurobiBackend(Backend):
+    def __init__(self, threads: int, isolated: bool = False):
+        # Gurobi environments are not thread safe
+        self.env = None
+        if isolated:
+            # started quietly: no licence banner for every probe
+            self.env = gp.Env(empty=True)
+            self.env.setParam("OutputFlag", 0)
+            self.env.start()
+        self.model = gp.Model(env=self.env)
+        self.model.setParam("Threads", threads)
+        self.var_count = 0
+        self.constr_count = 0
+
+    def add_vars(self, count: int, vtype: str, ub=None, name: str = "") -> VarBlock:
+        if ub is None:
+            ub = 1.0 if vtype == Backend.BINARY else gp.GRB.INFINITY
+        mvar = self.model.addMVar(count, vtype=VTYPE[vtype], ub=ub, name=name)
+        block = VarBlock(self.var_count, count, mvar)
+        self.var_count += count
+        return block
+
+    def add_constrs(self, terms, sense: str, rhs) -> ConstrBlock:
+        expr = sum(coeff @ block.handle for coeff, block in terms)
+        rhs = np.broadcast_to(np.asarray(rhs, dtype=float), expr.shape)
+        if sense == "<":
+            constr = self.model.addConstr(expr <= rhs)
+        elif sense == ">":
+            constr = self.model.addConstr(expr >= rhs)
+        else:
+            constr = self.model.addConstr(expr == rhs)
+        count = expr.shape[0]
+        block = ConstrBlock(self.constr_count, count, constr)
+        self.constr_count += count
+        return block
+
+    def set_rhs(self, block: ConstrBlock, rhs):
+        block.handle.RHS = np.broadcast_to(np.asarray(rhs, dtype=float), block.count)
+
+    def set_objective(self, terms, maximize: bool):
+        expr = sum(coeff @ block.handle for coeff, block in terms)
+        sense = gp.GRB.MAXIMIZE if maximize else gp.GRB.MINIMIZE
+        self.model.setObjective(expr.sum(), sense)
+
+    def set_param(self, name: str, value):
+        self.model.setParam(name, value)
+
+    def set_start(self, block: VarBlock, values):
+        block.handle.Start = values
+
+    def set_hint(self, block: VarBlock, values):
+        block.handle.VarHintVal = values
+
+    def optimize(self, feasibility: bool = False, lazy=None) -> Status:
+        if feasibility:
+            self.model.setParam("SolutionLimit", 1)
+            self.model.setParam("LogToConsole", 0)
+        if lazy is None:
+            self.model.optimize()
+            return self.status
+
+        def callback(model, where):
+            if where != gp.GRB.Callback.MIPSOL:
+                return
+            for terms, sense, rhs in lazy(solution):
+                exprs = linear_rows(terms)
+                for expr, value in zip(exprs, np.broadcast_to(rhs, len(exprs))):
+                    if sense == "<":
+                        model.cbLazy(expr <= value)
+                    elif sense == ">":
+                        model.cbLazy(expr >= value)
+                    else:
+                        model.cbLazy(expr == value)
+
+        def solution(block):
+            return np.asarray(self.model.cbGetSolution(block.handle.tolist()))
+
+        self.model.setParam("LazyConstraints", 1)
+        self.model.optimize(callback)
+        return self.status
+
+    def terminate(self):
+        self.model.terminate()
+
+    def dispose(self):
+        self.model.dispose()
+        if self.env is not None:
+            # releases the licence token of the environment
+            self.env.dispose()
+
+    @property
+    def status(self) -> Status:
+        status = STATUS.get(self.model.status, Status.OTHER)
+        if status == Status.TIME_LIMIT and self.model.SolCount > 0:
+            # stopped by the time limit after finding a solution
+            return Status.SOLUTION_LIMIT
+        return status
+
+    def values(self, block: VarBlock, index=None) -> np.ndarray:
+        handle = block.handle if index is None else block.handle[index]
+        return np.asarray(self.model.getAttr("X", handle.tolist()))
+
+    def stats(self) -> dict:
+        return {
+            "runtime": self.model.Runtime,
+            "node_count": get_attr(self.model, "NodeCount"),
+            "mip_gap": get_attr(self.model, "MIPGap"),
+            "status": self.status.value,
+            "num_vars": self.model.NumVars,
+            "num_constrs": self.model.NumConstrs,
+        }
+
+
+def linear_rows(terms):
+    """
+    One LinExpr for each row of a constraint block,
+    as needed by callbacks
+    """
+    count = terms[0][0].shape[0]
+    exprs = [gp.LinExpr() for _ in range(count)]
+    for coeff, block in terms:
+        coeff = sp.csr_matrix(coeff)
+        variables = block.handle.tolist()
+        for r, expr in enumerate(exprs):
+            begin, end = coeff.indptr[r], coeff.indptr[r + 1]
+            expr.addTerms(
+                coeff.data[begin:end].tolist(),
+                [variables[j] for j in coeff.indices[begin:end]],
+            )
+    return exprs
+
+
+def get_attr(model, name):
+    """
+    Some attributes (i.e. MIPGap) are not
+    available when the model is infeasible.
+    """
+    try:
+        return model.getAttr(name)
+    except (AttributeError, gp.GurobiError):
+        return None
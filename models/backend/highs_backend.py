@@ -0,0 +1,203 @@
+#! /usr/bin/python
+
+"""
+In-process open source backend: HiGHS
+through scipy.optimize.milp.
+The model is stored in matrix form and handed
+to the solver only when optimize is called.
+HiGHS (as exposed by scipy) has no solution limit:
+feasibility probes are solved with a null objective,
+so the first feasible solution is also optimal.
+MIP starts and hints are not supported and are ignored.
+There are no callbacks: lazy constraints are added
+after each solve, and the model is solved again.
+"""
+
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import milp, Bounds, LinearConstraint
+
+from .base import Backend, Status, VarBlock, ConstrBlock
+
+STATUS = {
+    0: Status.OPTIMAL,
+    1: Status.TIME_LIMIT,
+    2: Status.INFEASIBLE,
+    3: Status.UNBOUNDED,
+}
+
+# Gurobi parameter names understood by this backend
+OPTIONS = {
+    "TimeLimit": "time_limit",
+    "MIPGap": "mip_rel_gap",
+    "NodeLimit": "node_limit",
+    "LogToConsole": "disp",
+    "Presolve": "presolve",
+}
+
+# HiGHS presolve and log are on or off, Gurobi
+# has levels (-1 automatic) and integer flags
+CONVERT = {
+    "Presolve": lambda value: value != 0,
+    "LogToConsole": bool,
+}
+
+
+class HighsBackend(Backend):
+    def __init__(self, threads: int):
+        # each call to milp is independent: models are always isolated
+        # scipy does not expose HiGHS threads: parallelism comes from --jobs
+        self.upper = []
+        self.integrality = []
+        self.rows = []
+        self.blocks = []
+        self.lower_rhs = []
+        self.upper_rhs = []
+        self.objective = None
+        self.maximize = False
+        self.options = {}
+        self.var_count = 0
+        self.constr_count = 0
+        self.result = None
+        self.runtime = 0.0
+        # time limit reached between two rounds of lazy cuts
+        self.limited = False
+
+    def add_vars(self, count: int, vtype: str, ub=None, name: str = "") -> VarBlock:
+        if ub is None:
+            ub = 1.0 if vtype == Backend.BINARY else np.inf
+        self.upper.append(np.broadcast_to(np.asarray(ub, dtype=float), count))
+        integer = 0 if vtype == Backend.CONTINUOUS else 1
+        self.integrality.append(np.full(count, integer))
+        block = VarBlock(self.var_count, count)
+        self.var_count += count
+        return block
+
+    def add_constrs(self, terms, sense: str, rhs) -> ConstrBlock:
+        count = terms[0][0].shape[0]
+        rhs = np.broadcast_to(np.asarray(rhs, dtype=float), count)
+        lower = rhs if sense in (">", "=") else np.full(count, -np.inf)
+        upper = rhs if sense in ("<", "=") else np.full(count, np.inf)
+        self.rows.append(terms)
+        self.lower_rhs.append(lower)
+        self.upper_rhs.append(upper)
+        block = ConstrBlock(self.constr_count, count)
+        self.blocks.append(block)
+        self.constr_count += count
+        return block
+
+    def set_rhs(self, block: ConstrBlock, rhs):
+        i = self.blocks.index(block)
+        rhs = np.broadcast_to(np.asarray(rhs, dtype=float), block.count)
+        # only the finite sides are right hand sides
+        self.lower_rhs[i] = np.where(np.isfinite(self.lower_rhs[i]), rhs, -np.inf)
+        self.upper_rhs[i] = np.where(np.isfinite(self.upper_rhs[i]), rhs, np.inf)
+
+    def set_objective(self, terms, maximize: bool):
+        self.objective = terms
+        self.maximize = maximize
+
+    def set_param(self, name: str, value):
+        if name in CONVERT:
+            value = CONVERT[name](value)
+        try:
+            self.options[OPTIONS[name]] = value
+        except KeyError:
+            pass
+
+    def optimize(self, feasibility: bool = False, lazy=None) -> Status:
+        # the rounds of lazy cuts share the time limit
+        time_limit = self.options.get("time_limit")
+        runtime = 0.0
+        self.limited = False
+        while True:
+            remaining = None if time_limit is None else time_limit - runtime
+            if remaining is not None and remaining <= 0:
+                self.runtime = runtime
+                self.limited = True
+                return self.status
+            status = self.solve(feasibility, remaining)
+            runtime += self.runtime
+            cuts = lazy(self.values) if lazy and status.feasible else None
+            if not cuts:
+                self.runtime = runtime
+                return status
+            for terms, sense, rhs in cuts:
+                self.add_constrs(terms, sense, rhs)
+
+    def solve(self, feasibility: bool, time_limit=None):
+        cost = np.zeros(self.var_count)
+        if self.objective and not feasibility:
+            cost = self.to_matrix(self.objective).sum(axis=0).A1
+            if self.maximize:
+                cost = -cost
+
+        constraints = []
+        if self.rows:
+            matrix = sp.vstack([self.to_matrix(terms) for terms in self.rows])
+            lower = np.concatenate(self.lower_rhs)
+            upper = np.concatenate(self.upper_rhs)
+            constraints.append(LinearConstraint(matrix.tocsr(), lower, upper))
+
+        options = {"disp": not feasibility}
+        options.update(self.options)
+        if time_limit is not None:
+            options["time_limit"] = time_limit
+        start = time.perf_counter()
+        self.result = milp(
+            cost,
+            integrality=np.concatenate(self.integrality),
+            bounds=Bounds(0, np.concatenate(self.upper)),
+            constraints=constraints,
+            options=options,
+        )
+        self.runtime = time.perf_counter() - start
+        return self.status
+
+    def to_matrix(self, terms):
+        """
+        Place each term of a constraint block
+        in the columns of its variable block.
+        """
+        count = terms[0][0].shape[0]
+        output = sp.csr_matrix((count, self.var_count))
+        for coeff, block in terms:
+            coeff = sp.coo_matrix(coeff)
+            output = output + sp.csr_matrix(
+                (coeff.data, (coeff.row, coeff.col + block.start)),
+                shape=(count, self.var_count),
+            )
+        return output
+
+    @property
+    def status(self) -> Status:
+        if self.limited:
+            # the last solution may violate lazy cuts
+            return Status.TIME_LIMIT
+        if self.result is None:
+            return Status.OTHER
+        if self.result.status == 1 and self.result.x is not None:
+            # stopped by a limit after finding a solution
+            return Status.SOLUTION_LIMIT
+        return STATUS.get(self.result.status, Status.OTHER)
+
+    def values(self, block: VarBlock, index=None) -> np.ndarray:
+        select = np.arange(block.start, block.start + block.count)
+        if index is not None:
+            select = select[index]
+        values = self.result.x[select]
+        integer = np.concatenate(self.integrality)[select] == 1
+        # HiGHS returns integer values up to its tolerance
+        return np.where(integer, np.round(values), values) + 0.0
+
+    def stats(self) -> dict:
+        return {
+            "runtime": self.runtime,
+            "node_count": getattr(self.result, "mip_node_count", None),
+            "mip_gap": getattr(self.result, "mip_gap", None),
+            "status": self.status.value,
+            "num_vars": self.var_count,
+            "num_constrs": self.constr_count,
+        }
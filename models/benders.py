@@ -0,0 +1,70 @@
+#! /usr/bin/python
+
+"""
+Benders decomposition of Model 1 (single objective).
+The master problem only has the stop variables y and the
+customer variables z: the assignment block x is projected
+out. For fixed stops, a customer can be covered exactly
+when an open stop reaches it, so each subproblem is the cut
+    z_i <= sum_j delta_ij y_j
+Cuts are separated lazily, from the reach matrix, only for
+the customers a candidate solution covers without reach.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import scipy.sparse as sp
+
+from .backend import Backend, row, eye
+from .local_search import first_open_stop
+from .my_model_1 import MyModelOne
+
+
+@dataclass
+class MyModelOneBenders(MyModelOne):
+    def get_vars(self):
+        return self.facility_vars, None
+
+    def build_model(self, aps_count: int, alpha: float):
+        if getattr(self, "reach", None) is None:
+            self.reach = sp.csr_matrix(self.delta_coeff, dtype=float)
+        cust_count, loc_count = self.reach.shape
+        self.new_model(self.threads)
+        self.multiple = False
+        self.facility_vars = self.model.add_vars(loc_count, Backend.BINARY, name="y")
+        self.customer_vars = self.model.add_vars(cust_count, Backend.BINARY, name="z")
+        self.customer_facility_assign_vars = None
+
+        self.count_constr = self.model.add_constrs(
+            [(row(np.ones(loc_count)), self.facility_vars)], "=", aps_count
+        )
+        self.alpha_constr = self.model.add_constrs(
+            [(row(np.ones(cust_count)), self.customer_vars)], ">", alpha * cust_count
+        )
+        # customers out of reach of every stop are never covered
+        unreachable = np.flatnonzero(np.diff(self.reach.indptr) == 0)
+        if len(unreachable):
+            self.model.add_constrs(
+                [(eye(cust_count)[unreachable], self.customer_vars)], "<", 0
+            )
+        self.single_objective(self.lambda_coeff)
+
+    def lazy(self, solution):
+        """
+        Coverage cuts violated by a candidate solution
+        """
+        facilities = np.round(solution(self.facility_vars))
+        covered = solution(self.customer_vars) > 0.5
+        violated = np.flatnonzero(covered & (self.reach @ facilities < 0.5))
+        if not len(violated):
+            return []
+        cust_count, _ = self.reach.shape
+        terms = [
+            (eye(cust_count)[violated], self.customer_vars),
+            (-self.reach[violated], self.facility_vars),
+        ]
+        return [(terms, "<", 0)]
+
+    def get_assignment(self):
+        return first_open_stop(self.reach, self.get_facilities())
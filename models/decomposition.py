@@ -0,0 +1,115 @@
+#! /usr/bin/python
+
+"""
+Solve the instance independently on each connected
+component of the reach graph. Demand points and facility
+locations are the nodes, a demand point is linked to the
+locations that can reach it (see Model.coverage_graph).
+The coverage curve of each component is then combined
+with a knapsack-like dynamic program over the facility count.
+"""
+
+from dataclasses import dataclass
+from multiprocessing import Pool
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+from .abstract_model import Model
+
+
+@dataclass
+class Component:
+    demand_index: np.ndarray
+    facility_index: np.ndarray
+    # maximal number of facilities in the component
+    capacity: int
+
+
+def find_components(model: Model):
+    """
+    Split demand points and facility locations
+    into the connected components of the reach graph.
+    """
+    graph = sp.csr_matrix(model.coverage_graph(), dtype=bool)
+    demand_count, facility_count = graph.shape
+    adjacency = sp.bmat([[None, graph], [graph.T, None]], format="csr")
+    count, labels = connected_components(adjacency, directed=False)
+    capacity = model.facility_capacity()
+    output = []
+    for label in range(count):
+        (nodes,) = np.nonzero(labels == label)
+        demand_index = nodes[nodes < demand_count]
+        facility_index = nodes[nodes >= demand_count] - demand_count
+        cap = int(np.sum(capacity[facility_index]))
+        output.append(Component(demand_index, facility_index, cap))
+    return output
+
+
+@dataclass
+class ComponentCallback:
+    model: Model
+
+    def callback(self, task):
+        component, count = task
+        sub_model = self.model.restrict(
+            component.demand_index, component.facility_index
+        )
+        return sub_model.max_coverage(count)
+
+
+def combine_curves(curves, facility_max_count: int):
+    """
+    Knapsack over the components: best[k] is the maximal covered
+    weight using exactly k facilities, -inf if no assignment
+    of the k facilities to the components is feasible.
+    curves[c][m] is the coverage of component c with m facilities,
+    -inf when infeasible.
+    """
+    best = np.full(facility_max_count + 1, -np.inf)
+    best[0] = 0.0
+    for curve in curves:
+        update = np.full_like(best, -np.inf)
+        for count, value in enumerate(curve):
+            if count > facility_max_count or value == -np.inf:
+                continue
+            shifted = best[: len(best) - count] + value
+            update[count:] = np.maximum(update[count:], shifted)
+        best = update
+    return best
+
+
+def find_max_alpha_by_components(model: Model, facility_max_count: int, jobs: int):
+    """
+    Same result as find_max_alpha_by_facilities, computed
+    solving a max coverage model for each component and
+    each facility count it can hold. Alpha is 0 when
+    the facility count is infeasible.
+    """
+    components = find_components(model)
+    keys = []
+    tasks = []
+    for index, component in enumerate(components):
+        if len(component.demand_index) == 0:
+            # nothing to cover: no model to solve
+            continue
+        for count in range(min(component.capacity, facility_max_count) + 1):
+            keys.append((index, count))
+            tasks.append((component, count))
+
+    cb = ComponentCallback(model)
+    with Pool(jobs) as pool:
+        results = dict(zip(keys, pool.map(cb.callback, tasks, chunksize=1)))
+
+    curves = []
+    for index, component in enumerate(components):
+        curve = []
+        for count in range(min(component.capacity, facility_max_count) + 1):
+            value = results.get((index, count), 0.0)
+            curve.append(-np.inf if value is None else value)
+        curves.append(curve)
+
+    best = combine_curves(curves, facility_max_count)
+    total = model.demand_weights().sum()
+    return [max(value / total, 0.0) for value in best[1:]]
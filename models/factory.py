@@ -0,0 +1,34 @@
+#! /usr/bin/python
+
+"""
+Build the model of a log configuration, for the
+scripts working on many instances and configurations.
+"""
+
+from .model_GLS import ModelConfig, GendreauLaporteSemetModel
+from .my_model_1 import MyModelOne
+
+
+def make_model(kind, instance, conf, reach_index, threads=0, backend="gurobi"):
+    """
+    kind is 'gls' (conf is an (r1, r2) couple) or
+    'one' (conf is the radius). reach_index is the
+    ReachIndex of the instance distances.
+    """
+    if kind == "gls":
+        r1, r2 = conf
+        return GendreauLaporteSemetModel(
+            instance.demand,
+            ModelConfig(r1, r2),
+            instance.distances,
+            instance.locations,
+            threads,
+            backend,
+        ).setup(reach_index)
+    return MyModelOne(
+        instance.distances,
+        instance.lambda_coeff,
+        reach_index.reach(conf),
+        threads,
+        backend,
+    )
@@ -1,48 +1,468 @@
 #! /usr/bin/python
 
 
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import copy
 from dataclasses import dataclass
 from multiprocessing import Pool
+import threading
+import time
+import uuid
+
+import numpy as np
 
 from .abstract_model import Model
+from .alpha_space import ContinuousSpace, DiscreteSpace
+from .backend import CANCELLABLE
+from .probe import ProbeRecord
+
+
+@dataclass
+class SearchConfig:
+    """
+    tol: width of the final alpha interval
+    probes: number of alpha values probed concurrently
+        at each round. With probes > 1 the search is k-ary
+        and the interval shrinks by a factor probes + 1
+        per round.
+    discrete: search among the alpha values that the model
+        can actually achieve (see Model.alpha_levels). The result
+        is exact and tol is ignored. Falls back to the continuous
+        search when the model does not provide them.
+    warm_start: the last feasible facility vector is given
+        as MIP start to the following probes, and as hint
+        to the next facility count solved by the same process.
+    bounds: restrict the search to the interval given by
+        Model.alpha_bounds, when the model provides it.
+    time_limit: seconds given to each probe. A probe that
+        reaches it is unknown and the search continues around it.
+    deadline: time.time() after which no probe is started
+        and the running ones are stopped.
+    max_unknown: the search of a facility count stops
+        after this many unknown probes.
+    profile: solver parameters of the probes, see
+        models.tuning.ProbeProfile.
+    jump: after a feasible probe whose solution reaches a
+        higher alpha (see Model.solution_alpha), lower is raised
+        to it. When the interval left is at most jump times the
+        one the search started from, the next probe is just
+        above lower. 0 never probes just above.
+    """
+
+    tol: float = 1e-6
+    probes: int = 1
+    discrete: bool = False
+    warm_start: bool = False
+    bounds: bool = False
+    time_limit: float = None
+    deadline: float = None
+    max_unknown: int = 4
+    profile: object = None
+    jump: float = 0.05
+
+    def make_space(self, model: Model):
+        if self.discrete:
+            levels = model.alpha_levels()
+            if levels is not None:
+                return DiscreteSpace(levels)
+        return ContinuousSpace(self.tol)
+
+    def probe_time_limit(self):
+        """
+        Time limit of a probe started now, None if unlimited
+        """
+        limits = []
+        if self.time_limit is not None:
+            limits.append(self.time_limit)
+        if self.deadline is not None:
+            limits.append(max(0.0, self.deadline - time.time()))
+        return min(limits, default=None)
+
+    def probe_params(self, position, lower, upper):
+        """
+        Solver parameters of a probe at position, in the
+        (lower, upper) interval the search started from
+        """
+        if self.profile is None:
+            return None
+        return self.profile.params(position, lower, upper)
+
+    def anytime(self):
+        """
+        Results are [lower, upper] intervals when
+        probes or the whole search are time limited
+        """
+        return self.time_limit is not None or self.deadline is not None
+
+    def expired(self, unknown=()):
+        if len(unknown) >= self.max_unknown:
+            return True
+        return self.deadline is not None and time.time() >= self.deadline
+
+
+class Probe:
+    """
+    Check the feasibility of a single alpha value.
+    A probe can be cancelled from another thread.
+    """
+
+    def __init__(self, model: Model, facilities: int, position, alpha: float):
+        self.model = model
+        self.facilities = facilities
+        self.position = position
+        self.alpha = alpha
+        self.cancelled = False
+        self.disposed = False
+        self.lock = threading.Lock()
+        self.solution = None
+
+    def run(self, trace=None, start=None, hint=None, time_limit=None, params=None):
+        """
+        Return True if the model is feasible, False if it is
+        infeasible and None if the probe was cancelled or
+        time_limit seconds were not enough (the probe is unknown).
+        If trace is a list, a ProbeRecord is appended.
+        start and hint are facility vectors given to
+        the solver as MIP start and as variable hint.
+        params is a dict of solver parameters.
+        When feasible, the facility vector found is kept in solution.
+        """
+        begin = time.perf_counter()
+        self.model.build_model(self.facilities, self.alpha)
+        if start is not None:
+            self.model.set_start(start)
+        if hint is not None:
+            self.model.set_start(hint, hint=True)
+        if params:
+            self.model.set_params(params)
+        if time_limit is not None:
+            self.model.set_time_limit(time_limit)
+        build_time = time.perf_counter() - begin
+        if self.cancelled:
+            return None
+        feasible = self.model.is_fesible()
+        if self.cancelled:
+            feasible = None
+        if feasible:
+            self.solution = self.model.get_facilities()
+        if trace is not None:
+            trace.append(
+                ProbeRecord(
+                    self.alpha, feasible, build_time, **self.model.probe_stats()
+                )
+            )
+        return feasible
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            if not self.disposed:
+                self.model.terminate()
+
+    def dispose(self):
+        """
+        Free the solver resources of the model,
+        when the probe owns it (see isolated_copy)
+        """
+        with self.lock:
+            self.disposed = True
+            self.model.dispose()
+
+
+@dataclass
+class SearchResult:
+    alpha: float
+    # facility vector of the last feasible probe, if any
+    solution: object = None
+    # no alpha above upper is feasible: with unknown probes
+    # or when the deadline expires it may be above alpha
+    upper: float = None
 
 
-def find_max_alpha(model: Model, facilities: int, tol=1e-6):
+def next_gap(space, lower, upper, unknown):
+    """
+    Largest interval, between the known bounds and the
+    unknown positions, that can still be split.
+    None when the search is over.
+    """
+    points = [lower] + sorted(p for p in unknown if lower < p < upper) + [upper]
+    gaps = [(a, b) for a, b in zip(points, points[1:]) if not space.done(a, b)]
+    return max(gaps, key=lambda gap: (gap[1] - gap[0], gap[0]), default=None)
+
+
+def reached_position(model: Model, space, position, upper, solution):
+    """
+    Position of the alpha reached by the facility vector
+    found by a feasible probe at position, below upper
+    """
+    alpha = model.solution_alpha(np.round(solution).astype(int))
+    if alpha is None:
+        return position
+    reached, _ = space.bracket(alpha, alpha)
+    if position < reached < upper:
+        return reached
+    return position
+
+
+def find_max_alpha(model: Model, facilities: int, tol=1e-6, *, search=None, trace=None):
     """
     Search among possible alpha values
     to find the maximal value that allow the
     given instance to be feasible with the given number
     of facilities.
-    The value is searched using binary search.
-    """
-    min_alpha = 0.0
-    max_alpha = 1.0
-    while abs(min_alpha - max_alpha) > tol:
-        alpha = (max_alpha + min_alpha) / 2
-        model.build_model(facilities, alpha)
-        if model.is_fesible():
-            min_alpha = alpha
+    The value is searched using binary search,
+    or k-ary search when search.probes > 1.
+    tol is used only without search (see SearchConfig.tol).
+    If trace is a list, a ProbeRecord is appended
+    for each probe.
+    """
+    if search is None:
+        search = SearchConfig(tol=tol)
+    return search_max_alpha(model, facilities, search, trace).alpha
+
+
+def search_max_alpha(
+    model: Model,
+    facilities: int,
+    search=None,
+    trace=None,
+    hint=None,
+    bracket=None,
+    solution=None,
+):
+    """
+    Same as find_max_alpha, but return a SearchResult.
+    hint is an optional facility vector (i.e. the solution
+    for another facility count) used as solver hint
+    when search.warm_start is set.
+    bracket is an optional (lower, upper) alpha interval
+    known to contain the result, like Model.alpha_bounds.
+    solution is an optional feasible facility vector reaching
+    the lower end of bracket, used as MIP start when
+    search.warm_start is set and returned if nothing better
+    is found.
+    """
+    if search is None:
+        search = SearchConfig()
+    if not search.warm_start:
+        hint = None
+    space = search.make_space(model)
+    lower = space.lower
+    upper = space.upper
+    bounds = model.alpha_bounds(facilities) if search.bounds else None
+    if bounds is not None:
+        lower_alpha, upper_alpha, bounds_solution = bounds
+        lower, upper = space.bracket(lower_alpha, upper_alpha)
+        if solution is None:
+            solution = bounds_solution
+    if bracket is not None:
+        bracket_lower, bracket_upper = space.bracket(*bracket)
+        lower = max(lower, bracket_lower)
+        upper = max(lower, min(upper, bracket_upper))
+    initial = (lower, upper)
+    if search.probes > 1:
+        if model.backend not in CANCELLABLE:
+            raise ValueError(f"k-ary search needs a backend in {CANCELLABLE}")
+        return search_kary(
+            model, facilities, space, search, trace, hint, (lower, upper, solution)
+        )
+
+    unknown = set()
+    jump = False
+    while not search.expired(unknown):
+        gap = next_gap(space, lower, upper, unknown)
+        if gap is None:
+            break
+        if jump and gap[0] == lower:
+            position = space.above(lower)
         else:
-            max_alpha = alpha
-    return alpha
+            (position,) = space.points(*gap, 1)
+        probe = Probe(model, facilities, position, space.alpha(position))
+        start = solution if search.warm_start else None
+        params = search.probe_params(position, *initial)
+        feasible = probe.run(trace, start, hint, search.probe_time_limit(), params)
+        # no two jumps in a row
+        jump_probe, jump = jump, False
+        if feasible:
+            lower = reached_position(model, space, position, upper, probe.solution)
+            solution = probe.solution
+            left = (upper - lower) / (initial[1] - initial[0])
+            jump = not jump_probe and lower > position and left <= search.jump
+        elif feasible is False:
+            upper = position
+        else:
+            unknown.add(position)
+    return SearchResult(space.alpha(lower), solution, space.upper_bound(upper))
+
+
+def search_kary(model: Model, facilities: int, space, search, trace, hint, initial):
+    """
+    At each round, search.probes alpha values evenly spaced
+    in the current interval are checked concurrently.
+    As soon as a probe completes, the probes whose
+    result can no longer change the interval are cancelled.
+    initial is the (lower, upper, solution) to start from.
+    The probes of a round split the largest interval
+    left between bounds and unknown probes. After a jump
+    (see SearchConfig.jump) the first one is just above lower.
+    """
+    lower, upper, solution = initial
+    unknown = set()
+    first_lower, first_upper = lower, upper
+    jump = False
+    with ThreadPoolExecutor(search.probes) as executor:
+        while not search.expired(unknown):
+            gap = next_gap(space, lower, upper, unknown)
+            if gap is None:
+                break
+            positions = space.points(*gap, search.probes)
+            if jump and gap[0] == lower:
+                above = space.above(lower)
+                positions = [above] + [
+                    p
+                    for p in space.points(above, gap[1], search.probes - 1)
+                    if p < gap[1]
+                ]
+            jump_round, jump = jump, False
+            start = solution if search.warm_start else None
+            time_limit = search.probe_time_limit()
+            pending = {}
+            for position in positions:
+                alpha = space.alpha(position)
+                probe = Probe(isolated_copy(model), facilities, position, alpha)
+                params = search.probe_params(position, first_lower, first_upper)
+                future = executor.submit(
+                    run_isolated, probe, trace, start, hint, time_limit, params
+                )
+                pending[future] = probe
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    probe = pending.pop(future)
+                    feasible = future.result()
+                    if feasible:
+                        # a feasible probe at or below lower changes nothing
+                        if probe.position <= lower:
+                            continue
+                        lower = reached_position(
+                            model, space, probe.position, upper, probe.solution
+                        )
+                        solution = probe.solution
+                        left = (upper - lower) / (first_upper - first_lower)
+                        jump = (
+                            not jump_round
+                            and lower > probe.position
+                            and left <= search.jump
+                        )
+                    elif feasible is False:
+                        upper = min(upper, probe.position)
+                    elif not probe.cancelled and lower < probe.position < upper:
+                        unknown.add(probe.position)
+
+                # cancelled probes are not waited for
+                for future, probe in list(pending.items()):
+                    if not lower < probe.position < upper:
+                        probe.cancel()
+                        del pending[future]
+    return SearchResult(space.alpha(lower), solution, space.upper_bound(upper))
+
+
+def isolated_copy(model: Model):
+    """
+    Copy of the model that can be built and solved
+    concurrently with the original one.
+    Input data are shared.
+    """
+    output = copy.copy(model)
+    output.isolated = True
+    # the solver model of the original is never shared
+    output.model = None
+    return output
+
+
+def run_isolated(probe: Probe, *args):
+    """
+    Run a probe on an isolated copy, then free
+    the solver resources of the copy.
+    """
+    try:
+        return probe.run(*args)
+    finally:
+        probe.dispose()
+
+
+# last solution found by this process for each search,
+# used as hint for the following facility count
+last_solutions = {}
 
 
 @dataclass
 class PoolCallback:
     model: Model
+    trace: bool = False
+    search: SearchConfig = None
+    key: str = None
+    # return [lower, upper] alpha intervals
+    intervals: bool = False
+    # return the facility vectors found
+    solutions: bool = False
 
     def callback(self, i):
-        return find_max_alpha(self.model, i + 1)
+        probes = [] if self.trace else None
+        hint = last_solutions.get(self.key)
+        result = search_max_alpha(self.model, i + 1, self.search, probes, hint)
+        solution = None
+        if result.solution is not None:
+            last_solutions[self.key] = result.solution
+            solution = np.round(result.solution).astype(int).tolist()
+        alpha = result.alpha
+        if self.intervals:
+            alpha = [result.alpha, max(result.alpha, result.upper)]
+        if self.trace or self.solutions:
+            return alpha, probes, solution
+        return alpha
 
 
-def find_max_alpha_by_facilities(model: Model, facility_max_count: int, jobs: int):
+def find_max_alpha_by_facilities(
+    model: Model,
+    facility_max_count: int,
+    jobs: int,
+    trace=None,
+    search=None,
+    intervals=False,
+    solutions=None,
+):
     """
     Find the maximal alpha value depending on the number of facilities.
     Tries with any possible facility count from 1 to facility_max_count
+    If trace is a list, a (facility count, ProbeRecord) couple is
+    appended for each probe.
+    If intervals is set, each value is a certified [lower, upper]
+    interval, useful when probes have time limits.
+    If solutions is a list, the facility vector reaching the alpha
+    of each facility count (None if unknown) is appended.
     """
 
-    cb = PoolCallback(model)
+    cb = PoolCallback(
+        model,
+        trace is not None,
+        search,
+        uuid.uuid4().hex,
+        intervals,
+        solutions is not None,
+    )
     with Pool(jobs) as pool:
         output = pool.map(cb.callback, range(facility_max_count), chunksize=1)
 
-    return list(output)
+    if trace is None and solutions is None:
+        return list(output)
+
+    alphas = []
+    for i, (alpha, probes, solution) in enumerate(output):
+        alphas.append(alpha)
+        if trace is not None:
+            trace.extend((i + 1, p) for p in probes)
+        if solutions is not None:
+            solutions.append(solution)
+    return alphas
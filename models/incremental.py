@@ -0,0 +1,196 @@
+#! /usr/bin/python
+
+"""
+Update the alpha curve of an instance after a small change:
+new demand weights and facility locations added or removed
+(or with a different capacity). Demand points must be the same.
+For each facility count the previous result is shifted into
+an interval that certainly contains the new alpha:
+    - without removed locations, the previous solution is still
+      feasible and loses at most the demand that decreased;
+    - without added locations, any new solution was feasible
+      before and gains at most the demand that increased.
+Only the counts whose interval is too wide are solved again,
+inside the interval and with the previous solution as hint,
+and as MIP start when it is still feasible.
+"""
+
+from dataclasses import dataclass, replace
+from multiprocessing import Pool
+
+import numpy as np
+
+from .abstract_model import Model
+from .find_max_alpha import search_max_alpha, SearchConfig
+
+
+@dataclass
+class InstanceDiff:
+    # old index of each new location, -1 for new locations
+    column_map: np.ndarray
+    # new locations or more capacity
+    added: bool
+    # removed locations or less capacity
+    removed: bool
+    weight_increase: float
+    weight_decrease: float
+    old_total: float
+    new_total: float
+
+    def shift(self, lower: float, upper: float):
+        """
+        Interval containing the new alpha from the
+        interval containing the old one
+        """
+        if self.added:
+            upper = 1.0
+        else:
+            upper = (upper * self.old_total + self.weight_increase) / self.new_total
+        if self.removed:
+            lower = 0.0
+        else:
+            lower = (lower * self.old_total - self.weight_decrease) / self.new_total
+        return max(lower, 0.0), min(upper, 1.0)
+
+    def map_solution(self, solution):
+        """
+        Old facility vector on the new locations:
+        facilities on removed locations are dropped
+        """
+        output = np.zeros(len(self.column_map), dtype=int)
+        matched = self.column_map >= 0
+        output[matched] = np.asarray(solution)[self.column_map[matched]]
+        return output
+
+
+def diff_instances(old_model: Model, new_model: Model):
+    """
+    Locations are matched by their distance column.
+    """
+    old_dist = np.asarray(old_model.distances)
+    new_dist = np.asarray(new_model.distances)
+    if old_dist.shape[0] != new_dist.shape[0]:
+        raise ValueError("demand points changed: a full run is needed")
+
+    old_columns = {}
+    for j, column in enumerate(np.ascontiguousarray(old_dist.T)):
+        old_columns.setdefault(column.tobytes(), []).append(j)
+    column_map = np.full(new_dist.shape[1], -1)
+    for j, column in enumerate(np.ascontiguousarray(new_dist.T)):
+        candidates = old_columns.get(column.tobytes())
+        if candidates:
+            column_map[j] = candidates.pop(0)
+
+    old_capacity = np.asarray(old_model.facility_capacity())
+    new_capacity = np.asarray(new_model.facility_capacity())
+    matched = column_map >= 0
+    change = new_capacity[matched] - old_capacity[column_map[matched]]
+    removed = matched.sum() < len(old_capacity) or np.any(change < 0)
+    added = not matched.all() or np.any(change > 0)
+
+    old_weights = np.asarray(old_model.demand_weights(), dtype=float)
+    new_weights = np.asarray(new_model.demand_weights(), dtype=float)
+    weight_change = new_weights - old_weights
+    return InstanceDiff(
+        column_map,
+        bool(added),
+        bool(removed),
+        float(np.clip(weight_change, 0, None).sum()),
+        float(np.clip(-weight_change, 0, None).sum()),
+        float(old_weights.sum()),
+        float(new_weights.sum()),
+    )
+
+
+@dataclass
+class IncrementalCallback:
+    model: Model
+    search: SearchConfig
+    # facility count: (lower, upper, hint, solution)
+    tasks: dict
+
+    def callback(self, count):
+        lower, upper, hint, solution = self.tasks[count]
+        result = search_max_alpha(
+            self.model,
+            count,
+            self.search,
+            hint=hint,
+            bracket=(lower, upper),
+            solution=solution,
+        )
+        solution = None
+        if result.solution is not None:
+            solution = np.round(result.solution).astype(int).tolist()
+        return result.alpha, max(result.alpha, result.upper), solution
+
+
+@dataclass
+class IncrementalResult:
+    # [lower, upper] alpha interval of each facility count
+    intervals: list
+    solutions: list
+    # facility counts solved again
+    solved: list
+
+
+def incremental_alphas(
+    model: Model,
+    old_model: Model,
+    old_alphas: list,
+    old_solutions: list,
+    facility_max_count: int,
+    jobs: int,
+    search=None,
+    precision: float = 0.0,
+):
+    """
+    old_alphas has a value (or a [lower, upper] interval) for
+    each facility count of the previous run, old_solutions
+    the facility vectors (or None) when they were saved.
+    Facility counts whose interval is wider than precision
+    are solved again.
+    """
+    if search is None:
+        search = SearchConfig()
+    # previous solutions are given as hints and MIP starts
+    search = replace(search, warm_start=True)
+    diff = diff_instances(old_model, model)
+    capacity = np.asarray(model.facility_capacity())
+
+    intervals = []
+    solutions = []
+    tasks = {}
+    for count in range(1, facility_max_count + 1):
+        lower, upper = 0.0, 1.0
+        if count <= len(old_alphas):
+            old = np.atleast_1d(old_alphas[count - 1])
+            lower, upper = diff.shift(old[0], old[-1])
+
+        hint = None
+        if old_solutions and count <= len(old_solutions):
+            if old_solutions[count - 1] is not None:
+                hint = diff.map_solution(old_solutions[count - 1])
+        solution = None
+        if hint is not None and hint.sum() == count and np.all(hint <= capacity):
+            alpha = model.solution_alpha(hint)
+            if alpha is not None and alpha >= lower:
+                lower = alpha
+                solution = hint
+        upper = max(lower, upper)
+
+        intervals.append([lower, upper])
+        solutions.append(None if solution is None else solution.tolist())
+        if upper - lower > precision:
+            tasks[count] = (lower, upper, hint, solution)
+
+    solved = sorted(tasks)
+    if solved:
+        cb = IncrementalCallback(model, search, tasks)
+        with Pool(jobs) as pool:
+            output = pool.map(cb.callback, solved, chunksize=1)
+        for count, (lower, upper, solution) in zip(solved, output):
+            intervals[count - 1] = [lower, upper]
+            if solution is not None:
+                solutions[count - 1] = solution
+    return IncrementalResult(intervals, solutions, solved)
@@ -0,0 +1,229 @@
+#! /usr/bin/python
+
+"""
+Lagrangian relaxation of the Gendreau, Laporte and Semet
+model, maximizing the demand covered within the small radius
+with a given number of facilities. Constraints (2) and (4)
+are relaxed and the multipliers are optimized by subgradient.
+The relaxed problem is solved in closed form: each demand
+point is covered if its reduced weight is positive and the
+facilities go to the locations with the largest reduced cost.
+A Lagrangian heuristic repairs each relaxed solution into a
+feasible one, giving a lower bound at every iteration.
+"""
+
+from dataclasses import dataclass
+from multiprocessing import Pool
+
+import numpy as np
+import scipy.sparse as sp
+
+
+@dataclass
+class LagrangianBound:
+    """
+    upper: upper bound on the covered demand,
+        -inf when the facility count is infeasible
+    lower: covered demand of the best feasible
+        solution found, None if none was found
+    solution: facility vector of that solution
+    """
+
+    upper: float
+    lower: float = None
+    solution: np.ndarray = None
+
+
+@dataclass
+class SubgradientConfig:
+    iterations: int = 300
+    # initial step factor, halved after
+    # stall iterations without improvement
+    step: float = 2.0
+    stall: int = 20
+    min_step: float = 1e-4
+
+
+class Coverage:
+    """
+    Reach matrices as CSR, with their transpose
+    to read the points reached by a location
+    """
+
+    def __init__(self, coeff):
+        self.rows = sp.csr_matrix(coeff, dtype=float)
+        self.cols = self.rows.T.tocsr()
+
+    def reached(self, location: int):
+        begin, end = self.cols.indptr[location], self.cols.indptr[location + 1]
+        return self.cols.indices[begin:end]
+
+
+def relaxed_facilities(cost: np.ndarray, capacity: np.ndarray, count: int):
+    """
+    Place count facilities on the locations
+    with the largest cost, up to their capacity
+    """
+    order = np.argsort(-cost, kind="stable")
+    before = np.cumsum(capacity[order]) - capacity[order]
+    output = np.zeros(len(cost), dtype=int)
+    output[order] = np.clip(count - before, 0, capacity[order])
+    return output
+
+
+def repair(facilities, cost, count, capacity, delta: Coverage):
+    """
+    Add facilities until every demand point is reached
+    within the large radius (constraint (2)), each time
+    removing the facility with the lowest cost that is not
+    needed by (2). Return None if no feasible vector is found.
+    """
+    facilities = facilities.copy()
+    reach = delta.rows @ facilities
+    while True:
+        uncovered = reach < 0.5
+        if not uncovered.any():
+            return facilities
+        gain = delta.cols @ uncovered.astype(float)
+        gain[facilities >= capacity] = -1
+        location = np.argmax(gain)
+        if gain[location] <= 0:
+            return None
+        facilities[location] += 1
+        reach[delta.reached(location)] += 1
+
+        if facilities.sum() > count:
+            removable = [
+                j
+                for j in np.nonzero(facilities)[0]
+                if j != location and np.all(reach[delta.reached(j)] > 1.5)
+            ]
+            if not removable:
+                return None
+            worst = min(removable, key=lambda j: cost[j])
+            facilities[worst] -= 1
+            reach[delta.reached(worst)] -= 1
+
+
+def improve(facilities, weights, capacity, gamma: Coverage, delta: Coverage):
+    """
+    Local search on a feasible facility vector: move one
+    facility, keeping (2), while the covered demand grows.
+    """
+    facilities = facilities.copy()
+    while True:
+        coverage = gamma.rows @ facilities
+        reach = delta.rows @ facilities
+        best_gain = 1e-9
+        best_move = None
+        for j in np.nonzero(facilities)[0]:
+            if np.any(reach[delta.reached(j)] < 1.5):
+                continue
+            points = gamma.reached(j)
+            lost = points[coverage[points] < 1.5]
+            uncovered = (coverage < 0.5).astype(float)
+            uncovered[lost] = 1
+            gain = gamma.cols @ (weights * uncovered)
+            gain[facilities >= capacity] = -np.inf
+            gain[j] = -np.inf
+            k = np.argmax(gain)
+            move = gain[k] - weights[lost].sum()
+            if move > best_gain:
+                best_gain = move
+                best_move = (j, k)
+        if best_move is None:
+            return facilities
+        j, k = best_move
+        facilities[j] -= 1
+        facilities[k] += 1
+
+
+def lagrangian_bounds(model, count: int, config: SubgradientConfig = None):
+    """
+    Bound the demand covered within the small radius by a
+    GendreauLaporteSemetModel (already set up) with count facilities.
+    """
+    if config is None:
+        config = SubgradientConfig()
+    capacity = np.asarray(model.locations, dtype=int)
+    if capacity.sum() < count:
+        return LagrangianBound(-np.inf)
+
+    weights = np.asarray(model.demand, dtype=float)
+    gamma = Coverage(model.gamma_coeff)
+    delta = Coverage(model.delta_coeff)
+    # multipliers of (4) and (2)
+    mult_gamma = np.zeros(len(weights))
+    mult_delta = np.zeros(len(weights))
+
+    output = LagrangianBound(np.inf)
+    step = config.step
+    stall = 0
+    for _ in range(config.iterations):
+        reduced = weights - mult_gamma
+        covered = reduced > 0
+        cost = gamma.cols @ mult_gamma + delta.cols @ mult_delta
+        facilities = relaxed_facilities(cost, capacity, count)
+        upper = reduced[covered].sum() + cost @ facilities - mult_delta.sum()
+        if upper < output.upper - 1e-9:
+            output.upper = upper
+            stall = 0
+        else:
+            stall += 1
+            if stall >= config.stall:
+                step /= 2
+                stall = 0
+
+        feasible = repair(facilities, cost, count, capacity, delta)
+        if feasible is not None:
+            lower = weights @ (gamma.rows @ feasible > 0.5)
+            if output.lower is None or lower > output.lower:
+                output.lower = lower
+                output.solution = feasible
+
+        target = 0.0 if output.lower is None else output.lower
+        if output.upper - target <= 1e-9 * max(1.0, weights.sum()):
+            break
+        if step < config.min_step:
+            break
+
+        grad_gamma = gamma.rows @ facilities - covered
+        grad_delta = delta.rows @ facilities - 1
+        # no move for multipliers at zero that would become negative
+        grad_gamma[(mult_gamma <= 0) & (grad_gamma > 0)] = 0
+        grad_delta[(mult_delta <= 0) & (grad_delta > 0)] = 0
+        norm = grad_gamma @ grad_gamma + grad_delta @ grad_delta
+        if norm == 0:
+            break
+        length = step * (upper - target) / norm
+        mult_gamma = np.maximum(0, mult_gamma - length * grad_gamma)
+        mult_delta = np.maximum(0, mult_delta - length * grad_delta)
+
+    if output.lower is not None:
+        output.solution = improve(output.solution, weights, capacity, gamma, delta)
+        output.lower = weights @ (gamma.rows @ output.solution > 0.5)
+        # the dual bound cannot be below a feasible value
+        output.upper = max(output.upper, output.lower)
+    return output
+
+
+@dataclass
+class BoundCallback:
+    model: object
+
+    def callback(self, i):
+        return self.model.alpha_bounds(i + 1)
+
+
+def find_alpha_bounds_by_facilities(model, facility_max_count: int, jobs: int):
+    """
+    Approximate alpha curve, without the solver: return the
+    alpha achieved by the Lagrangian heuristic and the upper
+    bound for each facility count from 1 to facility_max_count
+    """
+    cb = BoundCallback(model)
+    with Pool(jobs) as pool:
+        bounds = pool.map(cb.callback, range(facility_max_count), chunksize=1)
+    lower = [0.0 if alpha is None else alpha for alpha, _, _ in bounds]
+    upper = [min(1.0, max(0.0, alpha)) for _, alpha, _ in bounds]
+    return lower, upper
@@ -0,0 +1,180 @@
+#! /usr/bin/python
+
+"""
+Swap local search for Model 1 (single objective):
+open count stops maximizing the sum of their lambda
+while at least alpha * n customers are within reach
+of an open stop. The number of open stops reaching each
+customer is kept up to date, and all the (open j, close k)
+swaps are evaluated at once from the reach matrix.
+"""
+
+from dataclasses import dataclass
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+
+@dataclass
+class SwapResult:
+    facilities: np.ndarray
+    # open stop assigned to each customer, -1 if none
+    assignment: np.ndarray
+    objective: float
+    covered: int
+    # at least alpha * n customers are covered
+    feasible: bool
+
+
+def first_open_stop(rows: sp.csr_matrix, facilities):
+    """
+    Assign each customer to its first open stop
+    in reach, -1 if no open stop reaches it
+    """
+    opened = np.flatnonzero(np.asarray(facilities) > 0.5)
+    reach = rows[:, opened].tocsr()
+    assignment = np.full(reach.shape[0], -1)
+    nonempty = np.diff(reach.indptr) > 0
+    assignment[nonempty] = opened[reach.indices[reach.indptr[:-1][nonempty]]]
+    return assignment
+
+
+class SwapSearch:
+    def __init__(self, delta_coeff, lambda_coeff: np.ndarray):
+        self.rows = sp.csr_matrix(delta_coeff, dtype=float)
+        self.cols = self.rows.tocsc()
+        self.lambda_coeff = np.asarray(lambda_coeff, dtype=float)
+        # a covered customer is worth more than any change of lambda
+        spread = self.lambda_coeff.max() - self.lambda_coeff.min()
+        self.penalty = 2 * spread + 1
+
+    def score(self, covered_gain, required, covered, lambda_gain):
+        """
+        Lexicographic score: first the customers
+        missing to reach required, then lambda
+        """
+        missing = max(required - covered, 0)
+        over = max(covered - required, 0)
+        useful = np.clip(covered_gain, -over, missing)
+        return self.penalty * useful + lambda_gain
+
+    def greedy(self, count: int, required: int):
+        """
+        Open stops one at a time, choosing the
+        best coverage gain, then the best lambda
+        """
+        loc_count = len(self.lambda_coeff)
+        facilities = np.zeros(loc_count, dtype=int)
+        cover = np.zeros(self.rows.shape[0])
+        for _ in range(min(count, loc_count)):
+            gain = self.rows.T @ (cover == 0).astype(float)
+            covered = np.count_nonzero(cover)
+            score = self.score(gain, required, covered, self.lambda_coeff)
+            score[facilities > 0] = -np.inf
+            j = np.argmax(score)
+            facilities[j] = 1
+            cover += self.column(j)
+        return facilities
+
+    def column(self, j: int):
+        return self.cols[:, j].toarray().ravel()
+
+    def best_swap(self, facilities, cover, required):
+        """
+        Best (open, close, score) swap, evaluated on all the
+        couples: the coverage change of opening j and closing k
+        is the new customers of j, minus the ones covered only by k,
+        plus the ones covered only by k that j also reaches.
+        """
+        closed = np.flatnonzero(facilities == 0)
+        opened = np.flatnonzero(facilities)
+        if len(closed) == 0 or len(opened) == 0:
+            return None
+        gain = self.rows.T @ (cover == 0).astype(float)
+        single = (cover == 1).astype(float)
+        loss = self.rows.T @ single
+        only = self.rows[np.flatnonzero(single)]
+        overlap = (only[:, closed].T @ only[:, opened]).toarray()
+
+        covered_gain = gain[closed, np.newaxis] - loss[np.newaxis, opened] + overlap
+        lambda_gain = (
+            self.lambda_coeff[closed, np.newaxis]
+            - self.lambda_coeff[np.newaxis, opened]
+        )
+        covered = np.count_nonzero(cover)
+        score = self.score(covered_gain, required, covered, lambda_gain)
+        j, k = np.unravel_index(np.argmax(score), score.shape)
+        return closed[j], opened[k], score[j, k]
+
+    def solve(
+        self,
+        count: int,
+        alpha: float,
+        start=None,
+        time_limit: float = 1.0,
+        kick: int = 2,
+        seed: int = 0,
+    ):
+        """
+        Improve start (or a greedy solution) by the best swap
+        until no swap improves. Then, until time_limit seconds
+        are spent, apply kick random swaps and improve again,
+        keeping the best solution (iterated local search).
+        """
+        begin = time.perf_counter()
+        rng = np.random.default_rng(seed)
+        cust_count = self.rows.shape[0]
+        required = int(np.ceil(alpha * cust_count - 1e-9))
+        if start is None:
+            facilities = self.greedy(count, required)
+        else:
+            facilities = np.asarray(start).round().astype(int)
+        cover = self.rows @ facilities
+        best = None
+        best_key = None
+
+        while True:
+            while time.perf_counter() - begin < time_limit:
+                move = self.best_swap(facilities, cover, required)
+                if move is None or move[2] <= 1e-9:
+                    break
+                self.swap(facilities, cover, move[0], move[1])
+
+            covered = np.count_nonzero(cover)
+            key = (min(covered, required), self.lambda_coeff @ facilities)
+            if best_key is None or key > best_key:
+                best = facilities.copy()
+                best_key = key
+            elif not np.array_equal(facilities, best):
+                # restart the kicks from the best solution
+                facilities = best.copy()
+                cover = self.rows @ facilities
+
+            closed = np.flatnonzero(facilities == 0)
+            opened = np.flatnonzero(facilities)
+            if time.perf_counter() - begin >= time_limit or not len(closed):
+                break
+            for j, k in zip(
+                rng.choice(closed, min(kick, len(closed)), replace=False),
+                rng.choice(opened, min(kick, len(opened)), replace=False),
+            ):
+                self.swap(facilities, cover, j, k)
+        return self.result(best, count, required)
+
+    def swap(self, facilities, cover, j: int, k: int):
+        facilities[j] = 1
+        facilities[k] = 0
+        cover += self.column(j) - self.column(k)
+
+    def result(self, facilities, count, required):
+        opened = np.flatnonzero(facilities)
+        assignment = first_open_stop(self.rows, facilities)
+        covered = int(np.count_nonzero(assignment >= 0))
+        return SwapResult(
+            facilities,
+            assignment,
+            float(self.lambda_coeff @ facilities),
+            covered,
+            covered >= required and len(opened) == count,
+        )
@@ -1,20 +1,31 @@
 #! /usr/bin/python
 
-""" 
-A gurobipy implementation of the model 
+"""
+An implementation of the model
 described in:
-    'Solving an Ambulance Location Model by Tabu Search' 
+    'Solving an Ambulance Location Model by Tabu Search'
         by Gendreau, Laporte and Semet.
 
 """
 
 from .abstract_model import Model
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
 import numpy as np
-import gurobipy as gp
+import scipy.sparse as sp
+
+from utils import compute_reach_coefficent, ReachIndex, PackedReach
+from .backend import Backend, row, eye
+from .alpha_space import subset_sum_levels
+from .lagrangian import lagrangian_bounds
+from .aggregation import group_points, group_reduce
+
 
-from utils import compute_reach_coefficent
+@dataclass
+class GendreauLaporteSemetInstance:
+    demand: np.ndarray
+    distances: np.ndarray
+    locations: np.ndarray
 
 
 @dataclass
@@ -26,7 +37,7 @@ class ModelConfig:
 @dataclass
 class GendreauLaporteSemetModel(Model):
     """
-    Build a Gurobi model
+    Build a MIP model on the selected backend
     """
 
     demand: np.ndarray
@@ -34,85 +45,154 @@ class GendreauLaporteSemetModel(Model):
     distances: np.ndarray
     locations: np.ndarray
     thread_count: int
+    backend: str = "gurobi"
 
-    def setup(self):
-        self.gamma_coeff = compute_reach_coefficent(
-            self.distances, self.config.radius_small
-        )
-        self.delta_coeff = compute_reach_coefficent(
-            self.distances, self.config.radius_large
-        )
+    def setup(self, reach_index: ReachIndex = None):
+        """
+        Compute the reach coefficients. When the ReachIndex
+        of the instance is given they are built directly
+        as sparse matrices from it.
+        """
+        if reach_index is None:
+            self.gamma_coeff = compute_reach_coefficent(
+                self.distances, self.config.radius_small
+            )
+            self.delta_coeff = compute_reach_coefficent(
+                self.distances, self.config.radius_large
+            )
+        else:
+            self.gamma_coeff = reach_index.sparse_reach(self.config.radius_small)
+            self.delta_coeff = reach_index.sparse_reach(self.config.radius_large)
+        self.packed = None
         return self
 
+    def evaluate(self, facilities):
+        """
+        Check a batch of facility vectors (one per row) on the
+        packed reach matrices: return, for each one, alpha,
+        the fraction of demand covered twice and whether
+        constraint (2) holds.
+        """
+        if self.packed is None:
+            self.packed = PackedReach(self.gamma_coeff), PackedReach(self.delta_coeff)
+        gamma, delta = self.packed
+        counts = gamma.counts(facilities)
+        total = self.demand.sum()
+        alpha = (counts >= 1) @ self.demand / total
+        double = (counts >= 2) @ self.demand / total
+        feasible = np.all(delta.counts(facilities) >= 1, axis=1)
+        return alpha, double, feasible
+
+    def solution_alpha(self, facilities):
+        (alpha,), _, (feasible,) = self.evaluate(facilities)
+        return alpha if feasible else None
+
+    def alpha_levels(self):
+        return subset_sum_levels(self.demand)
+
+    def alpha_bounds(self, count: int):
+        bound = lagrangian_bounds(self, count)
+        total = self.demand.sum()
+        lower = None if bound.lower is None else bound.lower / total
+        return lower, bound.upper / total, bound.solution
+
+    def facility_block(self):
+        return self.aps_count
+
+    def coverage_block(self):
+        return self.k_one_coverage
+
+    def demand_weights(self):
+        return self.demand
+
+    def facility_capacity(self):
+        return self.locations
+
+    def coverage_graph(self):
+        return sp.csr_matrix(self.gamma_coeff) + sp.csr_matrix(self.delta_coeff)
+
+    def restrict(self, demand_index, facility_index):
+        output = replace(
+            self,
+            demand=self.demand[demand_index],
+            distances=self.distances[np.ix_(demand_index, facility_index)],
+            locations=self.locations[facility_index],
+        )
+        return output.setup()
+
+    def aggregate(self, tolerance: float):
+        # grouping only depends on the distances up to the large radius
+        horizon = max(self.config.radius_small, self.config.radius_large) + tolerance
+        labels = group_points(self.distances, tolerance, horizon)
+        demand = np.bincount(labels, weights=self.demand)
+        output = []
+        for reduce in (np.maximum, np.minimum):
+            distances = group_reduce(self.distances, labels, reduce)
+            output.append(replace(self, demand=demand, distances=distances).setup())
+        return tuple(output)
+
     def build_model(self, facilities: int, alpha: float):
-        self.model = gp.Model()
+        self.new_model(self.thread_count)
         self.add_variables(len(self.locations), len(self.demand))
         self.add_constraints(facilities, alpha)
         self.add_objective()
-        self.model.setParam("Threads", self.thread_count)
 
     def add_variables(self, facility_locs: int, demand_locs: int):
         """
         Initialize model variables
         """
-        self.aps_count = self.model.addVars(
-            range(facility_locs), vtype=gp.GRB.INTEGER, name="y"
+        # constraint (7) is given as upper bound
+        self.aps_count = self.model.add_vars(
+            facility_locs, Backend.INTEGER, ub=self.locations, name="y"
         )
-        self.k_one_coverage = self.model.addVars(
-            range(demand_locs), vtype=gp.GRB.BINARY, name="x_1"
+        self.k_one_coverage = self.model.add_vars(
+            demand_locs, Backend.BINARY, name="x_1"
         )
-        self.k_two_coverage = self.model.addVars(
-            range(demand_locs), vtype=gp.GRB.BINARY, name="x_2"
+        self.k_two_coverage = self.model.add_vars(
+            demand_locs, Backend.BINARY, name="x_2"
         )
 
     def add_constraints(self, facilities: int, alpha: float):
+        demand_locs = len(self.demand)
+        delta_coeff = sp.csr_matrix(self.delta_coeff)
+        gamma_coeff = sp.csr_matrix(self.gamma_coeff)
+
         # constraint (2)
-        self.model.addConstrs(
-            gp.quicksum(
-                self.delta_coeff[i, j] * self.aps_count[j] for j in self.aps_count
-            )
-            >= 1
-            for i, v in enumerate(self.demand)
-        )
+        self.model.add_constrs([(delta_coeff, self.aps_count)], ">", 1)
 
         # constraint (3)
-        self.model.addConstr(
-            gp.quicksum(
-                d * self.k_one_coverage[x]
-                for d, x in zip(self.demand, self.k_one_coverage)
-            )
-            >= alpha * self.demand.sum()
+        self.model.add_constrs(
+            [(row(self.demand), self.k_one_coverage)],
+            ">",
+            alpha * self.demand.sum(),
         )
 
         # constraint (4)
-        self.model.addConstrs(
-            gp.quicksum(
-                self.gamma_coeff[i, j] * self.aps_count[j] for j in self.aps_count
-            )
-            >= self.k_one_coverage[x1] + self.k_two_coverage[x2]
-            for i, (x1, x2) in enumerate(zip(self.k_one_coverage, self.k_two_coverage))
+        self.model.add_constrs(
+            [
+                (gamma_coeff, self.aps_count),
+                (-eye(demand_locs), self.k_one_coverage),
+                (-eye(demand_locs), self.k_two_coverage),
+            ],
+            ">",
+            0,
         )
 
         # constraint (5)
-        self.model.addConstrs(
-            x_two <= x_one
-            for x_one, x_two in zip(self.k_one_coverage, self.k_two_coverage)
+        self.model.add_constrs(
+            [
+                (eye(demand_locs), self.k_two_coverage),
+                (-eye(demand_locs), self.k_one_coverage),
+            ],
+            "<",
+            0,
         )
 
         # constraint (6)
-        self.model.addConstr(gp.quicksum(self.aps_count) == facilities)
-
-        # constraint (7)
-        self.model.addConstrs(
-            self.aps_count[y] <= c for y, c in zip(self.aps_count, self.locations)
+        self.model.add_constrs(
+            [(row(np.ones(len(self.locations))), self.aps_count)], "=", facilities
         )
 
     def add_objective(self):
         # Objective function (1)
-        self.model.setObjective(
-            gp.quicksum(
-                d * self.k_two_coverage[k]
-                for d, k in zip(self.demand, self.k_two_coverage)
-            ),
-            gp.GRB.MAXIMIZE,
-        )
+        self.model.set_objective([(row(self.demand), self.k_two_coverage)], True)
@@ -1,61 +1,52 @@
 #! /usr/bin/python
 
-""" 
-This model is designed to identify 
-the best coupling between a customer 
-and a facility location. It aims to minimize 
-the total distance between each couple of 
-customer - facility. 
+"""
+This model is designed to identify
+the best coupling between a customer
+and a facility location. It aims to minimize
+the total distance between each couple of
+customer - facility.
 """
 
 from dataclasses import dataclass
 
-import gurobipy as gp
 import numpy as np
+import scipy.sparse as sp
 
 from .abstract_model import Model
+from .backend import Backend, row, eye
 
 
 @dataclass
 class FindBestCoupling(Model):
     distances: np.ndarray
     # delta_coeff: np.ndarray
+    backend: str = "gurobi"
 
     def build_model(self):
         customers, stops = self.distances.shape
-        self.model = gp.Model()
+        self.new_model(0)
         self.add_variables(customers, stops)
         self.add_constraints(customers, stops)
         self.add_objective_function(customers, stops)
 
     def add_variables(self, customers: int, stops: int):
-        self.coupling = np.empty((customers, stops), dtype=np.object)
-        for i in range(customers):
-            for j in range(stops):
-                var = self.model.addVar(vtype=gp.GRB.BINARY, name=f"x_{i}-{j}")
-                self.coupling[i, j] = var
-        self.model.update()
+        # x_{i, j} is stored at position i * stops + j
+        self.coupling = self.model.add_vars(customers * stops, Backend.BINARY, name="x")
 
     def add_constraints(self, customers: int, stops: int):
 
         # constraint 1
-        for i in range(customers):
-            self.model.addConstr(gp.quicksum(self.coupling[i, :]) == 1)
+        by_customer = sp.kron(eye(customers), row(np.ones(stops)), format="csr")
+        self.model.add_constrs([(by_customer, self.coupling)], "=", 1)
 
         # constraint 2
         gamma = get_gamma_param(customers, stops)
-        for j in range(stops):
-            self.model.addConstr(gp.quicksum(self.coupling[:, j]) <= gamma * customers)
+        by_stop = sp.kron(row(np.ones(customers)), eye(stops), format="csr")
+        self.model.add_constrs([(by_stop, self.coupling)], "<", gamma * customers)
 
     def add_objective_function(self, customers: int, stops: int):
-        self.model.setObjective(
-            gp.quicksum(
-                self.coupling[i, j] * self.distances[i, j]
-                for i in range(customers)
-                for j in range(stops)
-            ),
-            gp.GRB.MINIMIZE,
-        )
+        self.model.set_objective([(row(self.distances.ravel()), self.coupling)], False)
 
 
 def get_gamma_param(customer: int, stops: int):
@@ -1,15 +1,20 @@
 #! /usr/bin/python
 
-""" 
-This file contains the gurobipy implementation
+"""
+This file contains the implementation
 of my model.
 """
-from dataclasses import dataclass
+
+from dataclasses import dataclass, replace
 
 import numpy as np
-import gurobipy as gp
+import scipy.sparse as sp
 
+from utils import PackedReach
 from .abstract_model import Model
+from .backend import Backend, row, eye
+from .alpha_space import UniformLevels
+from .local_search import SwapSearch
 
 
 @dataclass
@@ -24,60 +29,138 @@ class MyModelOne(Model):
     lambda_coeff: np.ndarray
     delta_coeff: np.ndarray
     threads: int
+    backend: str = "gurobi"
 
     def get_vars(self):
         return self.facility_vars, self.customer_facility_assign_vars
 
+    def facility_block(self):
+        return self.facility_vars
+
+    def coverage_block(self):
+        return self.customer_vars
+
+    def demand_weights(self):
+        cust_count, _ = self.delta_coeff.shape
+        return np.ones(cust_count)
+
+    def facility_capacity(self):
+        _, loc_count = self.delta_coeff.shape
+        return np.ones(loc_count, dtype=int)
+
+    def coverage_graph(self):
+        return self.delta_coeff
+
+    def restrict(self, demand_index, facility_index):
+        return replace(
+            self,
+            distances=self.distances[np.ix_(demand_index, facility_index)],
+            lambda_coeff=self.lambda_coeff[facility_index],
+            delta_coeff=self.delta_coeff[np.ix_(demand_index, facility_index)],
+        )
+
+    def evaluate(self, facilities):
+        """
+        Check a batch of facility vectors (one per row):
+        return, for each one, the fraction of customers
+        within reach of an open stop and the objective.
+        """
+        if getattr(self, "packed", None) is None:
+            self.packed = PackedReach(self.delta_coeff)
+        facilities = np.atleast_2d(facilities)
+        alpha = np.mean(self.packed.counts(facilities) >= 1, axis=1)
+        return alpha, facilities @ self.lambda_coeff
+
+    def solution_alpha(self, facilities):
+        (alpha,), _ = self.evaluate(facilities)
+        return alpha
+
+    def heuristic(self, aps_count: int, alpha: float, time_limit: float = 1.0):
+        """
+        Solve the single objective model with the swap
+        local search, see models.local_search.
+        """
+        search = SwapSearch(self.delta_coeff, self.lambda_coeff)
+        return search.solve(aps_count, alpha, time_limit=time_limit)
+
+    def get_assignment(self):
+        """
+        Index of the stop assigned to each customer in
+        the solution, -1 if not assigned. Only assignment
+        variables inside the reach of a customer are read.
+        """
+        cust_count, loc_count = self.delta_coeff.shape
+        cust, loc = np.nonzero(self.delta_coeff)
+        assign = self.values(self.customer_facility_assign_vars, cust * loc_count + loc)
+        assignment = np.full(cust_count, -1)
+        selected = assign > 0.5
+        assignment[cust[selected]] = loc[selected]
+        return assignment
+
+    def alpha_levels(self):
+        # alpha is the fraction of covered customers
+        cust_count, _ = self.delta_coeff.shape
+        return UniformLevels(cust_count)
+
     def build_model(self, aps_count: int, alpha: float):
-        self.model = gp.Model()
-        self.multiple = False 
+        self.new_model(self.threads)
+        self.multiple = False
         self.setup_variables()
         self.setup_contraints(aps_count, alpha, self.delta_coeff)
         self.setup_objective_function(self.lambda_coeff)
 
+    def update_model(self, aps_count: int, alpha: float):
+        """
+        Change facility count and alpha of a built
+        model, without building it again
+        """
+        cust_count, _ = self.delta_coeff.shape
+        self.model.set_rhs(self.count_constr, aps_count)
+        self.model.set_rhs(self.alpha_constr, alpha * cust_count)
+
     def setup_variables(self):
         cust_count, loc_count = self.delta_coeff.shape
-        self.facility_vars = self.model.addVars(
-            range(loc_count), vtype=gp.GRB.BINARY, name="y"
-        )
-        self.customer_vars = self.model.addVars(
-            range(cust_count), vtype=gp.GRB.BINARY, name="z"
-        )
+        self.facility_vars = self.model.add_vars(loc_count, Backend.BINARY, name="y")
+        self.customer_vars = self.model.add_vars(cust_count, Backend.BINARY, name="z")
 
-        self.customer_facility_assign_vars = [
-            self.model.addVars(
-                range(loc_count),
-                vtype=gp.GRB.BINARY,
-                name=f"x_{j}",
-            )
-            for j in range(cust_count)
-        ]
-        self.model.update()
+        # x_{i, j} is stored at position i * loc_count + j
+        self.customer_facility_assign_vars = self.model.add_vars(
+            cust_count * loc_count, Backend.BINARY, name="x"
+        )
 
     def setup_contraints(self, aps_count: int, alpha: float, delta_coeff: np.ndarray):
         cust_count, loc_count = self.delta_coeff.shape
 
         # constrain 1
-        self.model.addConstr(gp.quicksum(self.facility_vars) == aps_count)
+        self.count_constr = self.model.add_constrs(
+            [(row(np.ones(loc_count)), self.facility_vars)], "=", aps_count
+        )
 
         # constrain 2
-
-        self.model.addConstrs(
-            self.customer_vars[i]
-            <= gp.quicksum(self.customer_facility_assign_vars[i].values())
-            for i in range(cust_count)
+        assign_sum = sp.kron(eye(cust_count), row(np.ones(loc_count)), format="csr")
+        self.model.add_constrs(
+            [
+                (eye(cust_count), self.customer_vars),
+                (-assign_sum, self.customer_facility_assign_vars),
+            ],
+            "<",
+            0,
         )
 
-        self.model.addConstr(
-            gp.quicksum(self.customer_vars.values()) >= alpha * len(self.customer_vars)
+        self.alpha_constr = self.model.add_constrs(
+            [(row(np.ones(cust_count)), self.customer_vars)], ">", alpha * cust_count
         )
 
         # constrain 4
-        self.model.addConstrs(
-            self.customer_facility_assign_vars[i][j]
-            <= delta_coeff[i, j] * self.facility_vars[j]
-            for i in range(cust_count)
-            for j in range(loc_count)
+        reach = sp.kron(np.ones((cust_count, 1)), eye(loc_count), format="csr")
+        reach = sp.diags(delta_coeff.ravel().astype(float)) @ reach
+        self.model.add_constrs(
+            [
+                (eye(cust_count * loc_count), self.customer_facility_assign_vars),
+                (-reach, self.facility_vars),
+            ],
+            "<",
+            0,
         )
 
         """
@@ -94,27 +177,17 @@ class MyModelOne(Model):
             self.single_objective(coeff)
 
     def single_objective(self, coeff: np.ndarray):
-        self.model.setObjective(
-            gp.quicksum(
-                l * self.facility_vars[y] for l, y in zip(coeff, self.facility_vars)
-            ),
-            gp.GRB.MAXIMIZE,
-        )
+        self.model.set_objective([(row(coeff), self.facility_vars)], True)
 
     def multiple_objective(self, coeff: np.ndarray):
         coeff = normalize(coeff)
-        cust_count, stop_count = self.distances.shape
         distances = normalize(self.distances)
-        self.model.setObjective(
-            gp.quicksum(
-                l * self.facility_vars[y] for l, y in zip(coeff, self.facility_vars)
-            )
-            - gp.quicksum(
-                distances[i, j] * self.customer_facility_assign_vars[i][j]
-                for i in range(cust_count)
-                for j in range(stop_count)
-            ),
-            gp.GRB.MAXIMIZE,
+        self.model.set_objective(
+            [
+                (row(coeff), self.facility_vars),
+                (-row(distances.ravel()), self.customer_facility_assign_vars),
+            ],
+            True,
         )
 
 
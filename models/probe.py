@@ -0,0 +1,29 @@
+#! /usr/bin/python
+
+"""
+Solver statistics collected for each
+feasibility probe made during the alpha search.
+"""
+
+from dataclasses import dataclass, asdict
+
+
+@dataclass
+class ProbeRecord:
+    """
+    feasible is None when the probe was cancelled
+    or stopped by its time limit (status time_limit)
+    """
+
+    alpha: float
+    feasible: bool
+    build_time: float
+    runtime: float
+    node_count: float
+    mip_gap: float
+    status: int
+    num_vars: int
+    num_constrs: int
+
+    def to_dict(self):
+        return asdict(self)
@@ -0,0 +1,92 @@
+#! /usr/bin/python
+
+"""
+Alpha curves of a model under many demand scenarios.
+Only the demand weights change between scenarios, so
+for each facility count the model is built once: the
+covered demand of every scenario is maximized by changing
+the objective, then one more variable t and one row per
+scenario give the robust alpha, the largest alpha reached
+in every scenario by the same facilities.
+"""
+
+from dataclasses import dataclass
+from multiprocessing import Pool
+
+import numpy as np
+import scipy.sparse as sp
+
+from .abstract_model import Model
+from .backend import Backend, Status, row
+
+
+@dataclass
+class ScenarioCurves:
+    # one alpha curve for each scenario
+    alphas: list
+    # pointwise minimum of the scenario curves
+    worst: list
+    robust: list
+
+
+def scenario_alphas(model: Model, count: int, demands: np.ndarray):
+    """
+    Return the maximal alpha of each scenario (a row of
+    demands) and the robust alpha with count facilities.
+    Alpha is 0 when count facilities are not feasible.
+    """
+    model.build_model(count, 0.0)
+    # values are used as they are: no optimality gap
+    model.model.set_param("MIPGap", 0)
+    model.model.set_param("LogToConsole", 0)
+    block = model.coverage_block()
+    totals = demands.sum(axis=1)
+
+    alphas = []
+    for weights, total in zip(demands, totals):
+        model.model.set_objective([(row(weights), block)], True)
+        if model.model.optimize(lazy=model.lazy) != Status.OPTIMAL:
+            return [0.0] * len(demands), 0.0
+        alphas.append(float(weights @ model.values(block)) / total)
+        # the solution is feasible for the next scenario
+        model.set_start(model.get_facilities())
+
+    robust = model.model.add_vars(1, Backend.CONTINUOUS, ub=1.0, name="t")
+    scaled = sp.csr_matrix(demands / totals[:, np.newaxis])
+    model.model.add_constrs(
+        [(scaled, block), (-sp.csr_matrix(np.ones((len(demands), 1))), robust)],
+        ">",
+        0,
+    )
+    model.model.set_objective([(row([1.0]), robust)], True)
+    if model.model.optimize(lazy=model.lazy) != Status.OPTIMAL:
+        return alphas, 0.0
+    return alphas, float(model.values(robust)[0])
+
+
+@dataclass
+class ScenarioCallback:
+    model: Model
+    demands: np.ndarray
+
+    def callback(self, i):
+        return scenario_alphas(self.model, i + 1, self.demands)
+
+
+def find_scenario_alphas_by_facilities(
+    model: Model, demands, facility_max_count: int, jobs: int
+):
+    """
+    demands is a scenarios x demand points matrix
+    replacing the demand weights of model.
+    """
+    demands = np.atleast_2d(np.asarray(demands, dtype=float))
+    if demands.shape[1] != len(model.demand_weights()):
+        raise ValueError("each scenario needs a weight for every demand point")
+    cb = ScenarioCallback(model, demands)
+    with Pool(jobs) as pool:
+        output = pool.map(cb.callback, range(facility_max_count), chunksize=1)
+    alphas = [list(curve) for curve in zip(*(values for values, _ in output))]
+    worst = [min(values) for values, _ in output]
+    robust = [value for _, value in output]
+    return ScenarioCurves(alphas, worst, robust)
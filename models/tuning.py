@@ -0,0 +1,137 @@
+#! /usr/bin/python
+
+"""
+Offline tuning of the solver parameters used by the
+feasibility probes. Probes well below the maximal alpha
+are feasible and are solved faster by looking for a
+solution, probes above it need an infeasibility proof.
+Sample probes of both kinds are taken from the alpha curve
+of a previous run, each candidate parameter set is timed on
+them and the best set of each kind is saved as a profile.
+"""
+
+from dataclasses import dataclass, field, asdict
+import itertools
+import json
+
+import numpy as np
+
+from .find_max_alpha import Probe
+
+# Gurobi parameters tried by the tuning, the HiGHS
+# backend ignores the ones it does not understand
+PARAMETER_GRID = {
+    "MIPFocus": [0, 1, 3],
+    "Presolve": [-1, 0, 2],
+    "Heuristics": [0.05, 0.5],
+    "Cuts": [-1, 0, 2],
+}
+
+
+@dataclass
+class ProbeProfile:
+    """
+    Solver parameters for the probes likely to be feasible
+    and for the ones likely to be infeasible. A probe is
+    likely feasible when it sits below split (as a fraction)
+    in the alpha interval the search started from.
+    """
+
+    feasible: dict = field(default_factory=dict)
+    infeasible: dict = field(default_factory=dict)
+    split: float = 0.5
+
+    def params(self, position, lower, upper):
+        if upper > lower and (position - lower) / (upper - lower) < self.split:
+            return self.feasible
+        return self.infeasible
+
+    def save(self, file_name):
+        with open(file_name, "w") as fp:
+            json.dump(asdict(self), fp, indent=2)
+
+
+def load_profile(file_name):
+    """
+    None if file_name is None
+    """
+    if file_name is None:
+        return None
+    with open(file_name) as fp:
+        return ProbeProfile(**json.load(fp))
+
+
+@dataclass
+class TuningSample:
+    model: object
+    count: int
+    alpha: float
+    # expected outcome
+    feasible: bool
+
+
+def curve_samples(model, alphas, offset: float):
+    """
+    Samples on both sides of the alpha curve of model:
+    offset below each value (or interval) is feasible,
+    offset above it is infeasible.
+    """
+    output = []
+    for count, value in enumerate(alphas, 1):
+        value = np.atleast_1d(value)
+        lower, upper = value[0], value[-1]
+        if lower - offset >= 0:
+            output.append(TuningSample(model, count, lower - offset, True))
+        if upper + offset <= 1:
+            output.append(TuningSample(model, count, upper + offset, False))
+    return output
+
+
+def candidate_params(size: int, seed: int = 0, grid=None):
+    """
+    The solver defaults followed by size - 1 distinct
+    parameter sets drawn at random from grid
+    """
+    if grid is None:
+        grid = PARAMETER_GRID
+    names = list(grid)
+    combinations = list(itertools.product(*grid.values()))
+    rng = np.random.default_rng(seed)
+    count = min(max(size - 1, 0), len(combinations))
+    chosen = rng.choice(len(combinations), count, replace=False)
+    return [{}] + [dict(zip(names, combinations[i])) for i in sorted(chosen)]
+
+
+def measure(samples, params: dict, time_limit: float):
+    """
+    Solver time spent on the samples with params. Probes stopped
+    by time_limit, or with an unexpected outcome, count twice
+    the time limit (PAR2 score).
+    """
+    total = 0.0
+    for sample in samples:
+        probe = Probe(sample.model, sample.count, None, sample.alpha)
+        records = []
+        feasible = probe.run(records, time_limit=time_limit, params=params)
+        if feasible == sample.feasible:
+            total += records[-1].runtime
+        else:
+            total += 2 * time_limit
+    return total
+
+
+def tune(samples, candidates, time_limit: float, split: float = 0.5):
+    """
+    Time every candidate on the feasible and on the infeasible
+    samples. Probes are run one at a time, so that timings
+    are comparable. Return the profile and, for each kind,
+    the (params, score) list.
+    """
+    profile = ProbeProfile(split=split)
+    scores = {}
+    for kind in ("feasible", "infeasible"):
+        group = [s for s in samples if s.feasible == (kind == "feasible")]
+        scores[kind] = [(p, measure(group, p, time_limit)) for p in candidates]
+        best, _ = min(scores[kind], key=lambda item: item[1])
+        setattr(profile, kind, best)
+    return profile, scores
@@ -5,9 +5,9 @@ from argparse import ArgumentParser
 from dataclasses import dataclass
 
 import numpy as np
-import matplotlib
 from matplotlib import pyplot as plt
 
+from plotting import render_files, add_batch_arguments
 from utils import load_instance
 
 @dataclass
@@ -18,33 +18,16 @@ class Locations:
 def scatter_matrix(values, marker, size):
     x = values[:, 0]
     y = values[:, 1]
-    plt.scatter(x, y, marker=marker, s=size)
+    plt.scatter(x, y, marker=marker, s=size, rasterized=True)
 
 
-
-def parse_args():
-    parser = ArgumentParser()
-    
-    parser.add_argument("locations", help="Specify locations")
-    parser.add_argument("--title", help="Set image title")
-    parser.add_argument("--file", help="Save image to file")
-
-    return parser.parse_args()
-
-def set_plot_relative_size(delta_w, delta_h):
-    w, h = plt.rcParams["figure.figsize"]
-    w *= delta_w
-    h *= delta_h
-    plt.rcParams["figure.figsize"] = (w, h)  
-
-def main():
-    font = {'family' : 'normal',
-        'size'   : 22}
-
-    matplotlib.rc('font', **font)
-    set_plot_relative_size(4, 4)
-    args = parse_args()
-    locs = load_instance(Locations, args.locations)
+def render(locations, output_file, args):
+    """
+    Draw the map of the locations file. Save it to output_file,
+    or show it if output_file is None
+    """
+    plt.figure()
+    locs = load_instance(Locations, locations)
     size = 35
     scatter_matrix(locs.clients, '.', size)
     scatter_matrix(locs.stops, 's', 3*size)
@@ -54,13 +37,32 @@ def main():
     
     plt.tight_layout()
     
-
-    if args.file:
-        plt.savefig(args.file)
+    if output_file:
+        plt.savefig(output_file)
     else:
         plt.show()
 
 
+def parse_args():
+    parser = ArgumentParser()
+    
+    parser.add_argument(
+        "locations",
+        help="Specify locations. Many files or glob patterns "
+        "can be given to render them in batch (see --output-dir)",
+        nargs="+",
+    )
+    parser.add_argument("--title", help="Set image title")
+    parser.add_argument("--file", help="Save image to file")
+    add_batch_arguments(parser)
+
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    render_files(render, args.locations, args)
+
+
 if __name__ == '__main__':
     main()
 
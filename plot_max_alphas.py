@@ -1,6 +1,6 @@
 #! /usr/bin/python
 
-""" 
+"""
 Generate a plot from aps_loc output.
 """
 
@@ -8,9 +8,10 @@ from argparse import ArgumentParser
 import json
 
 import numpy as np
-import matplotlib
 from matplotlib import pyplot as plt
 
+from plotting import render_files, add_batch_arguments
+
 
 def radii_to_str(radii):
     try:
@@ -27,30 +28,74 @@ def load_instance(file_name):
     with open(file_name) as file:
         data = json.load(file)
 
-    output = {radii_to_str(radii): np.array(vals) for radii, vals in data}
+    output = {radii_to_str(radii): to_bounds(vals) for radii, vals in data}
     return output
 
 
-def plot_one_figure(inst: dict, min_th, max_th):
+def to_bounds(vals):
+    """
+    Lower and upper alpha arrays. Anytime runs log
+    [lower, upper] intervals, other runs exact values.
+    """
+    pairs = [np.atleast_1d(v) for v in vals]
+    lower = np.array([p[0] for p in pairs], dtype=float)
+    upper = np.array([p[-1] for p in pairs], dtype=float)
+    return lower, upper
+
+
+def plot_one_figure(inst: dict, min_th, max_th, bands=False):
     legend = []
-    for k, v in inst.items():
+    lines = []
+    for k, (v, upper) in inst.items():
         sel = np.logical_and(min_th <= v, v <= max_th)
         if sel.any():
             x = np.arange(1, len(v) + 1)
             x_sel = x[sel]
             v_sel = v[sel]
             legend.append(k)
-            plt.plot(x_sel, v_sel, "o-.")
-
-    plt.legend(legend)
+            (line,) = plt.plot(x_sel, v_sel, "o-.")
+            lines.append(line)
+            if bands and (upper > v).any():
+                plt.fill_between(
+                    x_sel,
+                    v_sel,
+                    np.minimum(upper[sel], max_th),
+                    color=line.get_color(),
+                    alpha=0.2,
+                )
+
+    plt.legend(lines, legend)
     plt.grid(alpha=0.65, linestyle="dotted")
     plt.xticks(x)
 
 
+def render(log_file, output_file, args):
+    """
+    Draw the figure of log_file. Save it to output_file,
+    or show it if output_file is None
+    """
+    plt.figure()
+    logs = load_instance(log_file)
+    plot_one_figure(logs, args.min_threshold, args.max_threshold, args.bands)
+    if args.title:
+        plt.title(args.title)
+
+    plt.tight_layout()
+    if output_file:
+        plt.savefig(output_file)
+    else:
+        plt.show()
+
+
 def parse_args():
     parser = ArgumentParser()
     parser.add_argument("--title", help="set image title")
-    parser.add_argument("log_file", help="output file from asp_loc.py")
+    parser.add_argument(
+        "log_file",
+        help="output file from asp_loc.py. Many files or glob patterns "
+        "can be given to render them in batch (see --output-dir)",
+        nargs="+",
+    )
     parser.add_argument(
         "--min-threshold",
         help="set the minimal alpha to show. Default to 0.4",
@@ -63,32 +108,20 @@ def parse_args():
         type=float,
         default=0.95,
     )
+    parser.add_argument(
+        "--bands",
+        help="shade the interval up to the upper bound of logs of anytime runs, "
+        "whose lower bound is plotted",
+        action="store_true",
+    )
     parser.add_argument("--file", help="save image to file", default=None)
+    add_batch_arguments(parser)
     return parser.parse_args()
 
-def set_plot_relative_size(delta_w, delta_h):
-    w, h = plt.rcParams["figure.figsize"]
-    w *= delta_w
-    h *= delta_h
-    plt.rcParams["figure.figsize"] = (w, h)  
 
 def main():
-    font = {'family' : 'normal',
-        'size'   : 22}
-
-    matplotlib.rc('font', **font)
-    set_plot_relative_size(4, 4)
     args = parse_args()
-    logs = load_instance(args.log_file)
-    plot_one_figure(logs, args.min_threshold, args.max_threshold)
-    if args.title:
-        plt.title(args.title)
-
-    plt.tight_layout()
-    if args.file:
-        plt.savefig(args.file)
-    else:
-        plt.show()
+    render_files(render, args.log_file, args)
 
 
 if __name__ == "__main__":
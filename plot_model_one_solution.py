@@ -6,103 +6,99 @@ Plot the soluton from Model one
 from argparse import ArgumentParser
 
 import numpy as np
-import matplotlib
 from matplotlib import pyplot as plt
 
-from utils import load_json_file, to_ndarray
+from plotting import setup_style
+from utils import load_json_file, load_solution, to_ndarray
 
 
-def random_color():
-    return np.random.random((1, 3))
-
-
-def find_assignment(client_assignment):
-    selected = client_assignment == 1
-    indexes = [i for i in range(len(selected)) if selected[i]]
-    if indexes:
-        return np.random.choice(indexes, 1)[0] 
-    return None
+def random_colors(count):
+    return np.random.random((count, 3))
 
 
 def make_assignment(solution):
-    for i, client_assignment in enumerate(solution):
-        sel = find_assignment(client_assignment)
-        if sel:
-            yield (i, sel)
+    """
+    Convert a dense customers x stops solution matrix
+    to the index of the stop assigned to each customer,
+    -1 if the customer is not assigned
+    """
+    assignment = solution.argmax(axis=1)
+    assigned = solution[np.arange(len(solution)), assignment] == 1
+    return np.where(assigned, assignment, -1)
+
+
+def load_assignment(solution):
+    """
+    Solutions store either the sparse 'assignment'
+    list or the dense 'x' matrix
+    """
+    if "assignment" in solution:
+        return to_ndarray(solution, "assignment")
+    return make_assignment(to_ndarray(solution, "x"))
 
 
 def plot_stops(stops, selected_stops):
-    color_sel = {}
-    for i, (sel, (x, y)) in enumerate(zip(selected_stops, stops)):
-        if sel:
-            marker = "s"
-            color = random_color()
-            color_sel[i] = color
-        else:
-            marker = "o"
-            color = "k"
-
-        plt.scatter([x], [y], marker=marker, c=color, s=105)
-    return color_sel
-
-
-class ClientCoordinate:
-    def __init__(self, p):
-        x, y = p
-        self.x = [x]
-        self.y = [y]
-
-    def add_point(self, p):
-        x, y = p
-        self.x.append(x)
-        self.y.append(y)
-
-
-def plot_client(colors, client_loc, solution):
-    client_sel = {}
-    for i, sel in make_assignment(solution):
-
-        try:
-            client_sel[sel].add_point(client_loc[i])
-        except KeyError:
-            client_sel[sel] = ClientCoordinate(client_loc[i])
-
-    for sel, coord in client_sel.items():
-        plt.scatter(coord.x, coord.y, marker=".", c=colors[sel], s=35)
+    """
+    Return a color for each stop, meaningful
+    only for the selected ones
+    """
+    selected = selected_stops > 0.5
+    colors = np.zeros((len(stops), 3))
+    colors[selected] = random_colors(selected.sum())
+
+    closed = stops[~selected]
+    plt.scatter(closed[:, 0], closed[:, 1], marker="o", c="k", s=105, rasterized=True)
+    opened = stops[selected]
+    plt.scatter(
+        opened[:, 0],
+        opened[:, 1],
+        marker="s",
+        c=colors[selected],
+        s=105,
+        rasterized=True,
+    )
+    return colors
+
+
+def plot_client(colors, client_loc, assignment):
+    assigned = assignment >= 0
+    clients = client_loc[assigned]
+    plt.scatter(
+        clients[:, 0],
+        clients[:, 1],
+        marker=".",
+        c=colors[assignment[assigned]],
+        s=35,
+        rasterized=True,
+    )
 
 
 def parse_args():
     parser = ArgumentParser()
     parser.add_argument("locations", help="set location JSON file")
-    parser.add_argument("solution", help="set solution file")
+    parser.add_argument("solution", help="set solution file (JSON or .npz)")
     parser.add_argument("--title", help="set image title", default="")
-    parser.add_argument("--file", help="save image to file", default=None)
+    parser.add_argument(
+        "--file", help="save image to file, without opening a window", default=None
+    )
 
     return parser.parse_args()
 
-def set_plot_relative_size(delta_w, delta_h):
-    w, h = plt.rcParams["figure.figsize"]
-    w *= delta_w
-    h *= delta_h
-    plt.rcParams["figure.figsize"] = (w, h)  
-
 def main():
-    font = {'family' : 'normal',
-        'size'   : 22}
-
-    matplotlib.rc('font', **font)
-    set_plot_relative_size(4, 4)
     args = parse_args()
+    if args.file:
+        plt.switch_backend("Agg")
+    setup_style()
     locations = load_json_file(args.locations)
     stops = to_ndarray(locations, "stops")
     clients = to_ndarray(locations, "clients")
 
-    solution = load_json_file(args.solution)
+    solution = load_solution(args.solution)
     selected_stops = to_ndarray(solution, "y")
-    solution = to_ndarray(solution, "x")
+    assignment = load_assignment(solution)
 
     colors = plot_stops(stops, selected_stops)
-    plot_client(colors, clients, solution)
+    plot_client(colors, clients, assignment)
 
     if args.title:
         plt.title(args.title)
@@ -0,0 +1,4 @@
+#! /usr/bin/python
+
+from .style import setup_style, set_plot_relative_size
+from .batch import expand_inputs, render_batch, render_files, add_batch_arguments
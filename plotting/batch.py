@@ -0,0 +1,116 @@
+#! /usr/bin/python
+
+"""
+Render many input files, one figure each,
+headless and across a process pool.
+"""
+
+from dataclasses import dataclass
+import glob
+import os
+import sys
+from multiprocessing import Pool
+
+from matplotlib import pyplot as plt
+
+from .style import setup_style
+
+
+def expand_inputs(patterns):
+    """
+    Expand glob patterns, keeping the
+    given order. Patterns matching nothing
+    are kept as file names.
+    """
+    output = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        output.extend(matches or [pattern])
+    return output
+
+
+def output_name(input_file, output_dir, fmt):
+    stem, _ = os.path.splitext(os.path.basename(input_file))
+    return os.path.join(output_dir, f"{stem}.{fmt}")
+
+
+def init_worker():
+    plt.switch_backend("Agg")
+    setup_style()
+
+
+@dataclass
+class BatchTask:
+    """
+    render(input_file, output_file, options)
+    must draw and save a single figure.
+    """
+
+    render: object
+    options: object
+
+    def __call__(self, files):
+        """
+        Return None on success, the error message
+        otherwise: a broken input does not stop the batch.
+        """
+        input_file, output_file = files
+        try:
+            self.render(input_file, output_file, self.options)
+        except Exception as err:
+            return f"{input_file}: {err}"
+        finally:
+            plt.close("all")
+        return None
+
+
+def render_batch(render, options, inputs, output_dir, fmt, jobs):
+    """
+    Render each input to output_dir/<input name>.<fmt>.
+    Errors are printed on stderr. Return the number of failed inputs.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    files = [(f, output_name(f, output_dir, fmt)) for f in inputs]
+    with Pool(jobs, initializer=init_worker) as pool:
+        errors = pool.map(BatchTask(render, options), files, chunksize=1)
+    errors = [err for err in errors if err]
+    for err in errors:
+        print(err, file=sys.stderr)
+    return len(errors)
+
+
+def add_batch_arguments(parser):
+    parser.add_argument(
+        "--output-dir",
+        help="batch mode: save one image per input in this directory. "
+        "Default '.' when many inputs are given",
+        default=None,
+    )
+    parser.add_argument(
+        "--format", help="batch mode image format. Default png", default="png"
+    )
+    parser.add_argument(
+        "--jobs",
+        help="batch mode: number of parallel processes. Default 1",
+        type=int,
+        default=1,
+    )
+
+
+def render_files(render, patterns, args):
+    """
+    Render a single input to args.file (or show it),
+    or, with many inputs or args.output_dir set, render
+    all of them in batch.
+    """
+    inputs = expand_inputs(patterns)
+    if len(inputs) > 1 or args.output_dir:
+        output_dir = args.output_dir or "."
+        if render_batch(render, args, inputs, output_dir, args.format, args.jobs):
+            sys.exit(1)
+        return
+
+    if args.file:
+        plt.switch_backend("Agg")
+    setup_style()
+    render(inputs[0], args.file, args)
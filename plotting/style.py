@@ -0,0 +1,26 @@
+#! /usr/bin/python
+
+"""
+Styling shared by every plot script
+"""
+
+import matplotlib
+from matplotlib import pyplot as plt
+
+FONT = {"family": "normal", "size": 22}
+
+
+def set_plot_relative_size(delta_w, delta_h):
+    w, h = plt.rcParams["figure.figsize"]
+    w *= delta_w
+    h *= delta_h
+    plt.rcParams["figure.figsize"] = (w, h)
+
+
+def setup_style():
+    """
+    Must be called once per process:
+    figure size is scaled each time.
+    """
+    matplotlib.rc("font", **FONT)
+    set_plot_relative_size(4, 4)
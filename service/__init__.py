@@ -0,0 +1,12 @@
+#! /usr/bin/python
+
+"""
+Long running local solve service.
+The server keeps instances and reach structures in memory
+and runs every facility count of every submitted job
+on a single, long lived, worker pool.
+The server, and the models it imports, are loaded from
+service.server: clients only need service.protocol.
+"""
+
+from .protocol import DEFAULT_SOCKET, send_message, read_message
@@ -0,0 +1,176 @@
+#! /usr/bin/python
+
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, fields
+import hashlib
+import json
+import os
+
+from models import (
+    GendreauLaporteSemetInstance,
+    MyModelOneInstance,
+    PoolCallback,
+    make_model,
+)
+from models.find_max_alpha import last_solutions
+from models.backend import CANCELLABLE
+from utils import load_instance, ReachIndex, search_config
+
+
+@dataclass
+class JobRequest:
+    """
+    model: 'gls' or 'one'
+    instance: path of the instance file, as seen by the server
+    config: content of the configuration file
+    """
+
+    model: str
+    instance: str
+    config: list
+    threads: int = 0
+    backend: str = "gurobi"
+    probes: int = 1
+    discrete: bool = False
+    warm_start: bool = False
+    bounds: bool = False
+    probe_time_limit: float = None
+    time_budget: float = None
+    profile: str = None
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        names = {f.name for f in fields(cls)}
+        request = cls(**{k: v for k, v in data.items() if k in names})
+        if request.model not in ("gls", "one"):
+            raise ValueError(f"unknown model '{request.model}'")
+        if request.probes > 1 and request.backend not in CANCELLABLE:
+            raise ValueError(f"probes > 1 requires a backend in {CANCELLABLE}")
+        return request
+
+    def key(self):
+        """
+        Identical requests on an unchanged
+        instance file have the same key.
+        """
+        data = asdict(self)
+        data["mtime"] = os.stat(self.instance).st_mtime_ns
+        text = json.dumps(data, sort_keys=True)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def search(self):
+        return search_config(self)
+
+
+class LRUCache:
+    def __init__(self, size: int):
+        self.size = size
+        self.items = OrderedDict()
+
+    def get(self, key, factory):
+        try:
+            self.items.move_to_end(key)
+            return self.items[key]
+        except KeyError:
+            value = factory()
+            self.put(key, value)
+            return value
+
+    def find(self, key):
+        """
+        None if key is not cached
+        """
+        if key not in self.items:
+            return None
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def put(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        if len(self.items) > self.size:
+            self.items.popitem(last=False)
+
+
+class ModelCache:
+    """
+    Keep loaded instances and models, with their
+    reach coefficients, in memory between jobs.
+    The server only loads instances, each worker
+    process keeps the models it solved.
+    """
+
+    def __init__(self, size: int = 64):
+        self.instances = LRUCache(size)
+        self.indexes = LRUCache(size)
+        self.models = LRUCache(size)
+
+    def load(self, kls, file_name):
+        """
+        Return the instance and its cache key
+        """
+        key = (kls.__name__, file_name, os.stat(file_name).st_mtime_ns)
+        instance = self.instances.get(key, lambda: load_instance(kls, file_name))
+        return instance, key
+
+    def reach_index(self, instance, instance_key):
+        """
+        Sorted distance index, shared by all
+        the radii tried on the instance
+        """
+        return self.indexes.get(instance_key, lambda: ReachIndex(instance.distances))
+
+    def configs(self, request: JobRequest):
+        """
+        Return a list of (log config, facility count), one for
+        each configuration in the request. Models are not built.
+        """
+        if request.model == "gls":
+            instance, _ = self.load(GendreauLaporteSemetInstance, request.instance)
+            count = len(instance.locations)
+            return [((r1, r2), count) for r1, r2 in request.config]
+        instance, _ = self.load(MyModelOneInstance, request.instance)
+        count = len(instance.lambda_coeff)
+        return [(radius, count) for radius in request.config]
+
+    def model(self, request: JobRequest, conf):
+        """
+        Model of a configuration of the request
+        """
+        kls = (
+            GendreauLaporteSemetInstance
+            if request.model == "gls"
+            else MyModelOneInstance
+        )
+        instance, instance_key = self.load(kls, request.instance)
+
+        def factory():
+            return make_model(
+                request.model,
+                instance,
+                conf,
+                self.reach_index(instance, instance_key),
+                request.threads,
+                request.backend,
+            )
+
+        key = (instance_key, str(conf), request.threads, request.backend)
+        return self.models.get(key, factory)
+
+
+# models of the worker process, see solve_task
+worker_cache = ModelCache()
+
+
+def solve_task(request: JobRequest, conf, search, key: str, running, i):
+    """
+    Run in a worker process: search the alpha of i + 1
+    facilities for conf. The model is built on first use
+    and kept by the worker. Hints of the jobs no longer
+    running are dropped.
+    """
+    for stale in [k for k in last_solutions if k not in running]:
+        del last_solutions[stale]
+    model = worker_cache.model(request, conf)
+    cb = PoolCallback(model, search=search, key=key, intervals=search.anytime())
+    return cb.callback(i)
@@ -0,0 +1,31 @@
+#! /usr/bin/python
+
+"""
+Messages are JSON objects, one per line.
+The client sends a single job request, the server
+answers with a stream of events:
+    {"type": "result", "config": ..., "count": ..., "alpha": ...}
+one for each (config, facility count) as soon as it is solved, then
+    {"type": "done", "log": ...}
+with the full log, in the same format saved by utils.Log, or
+    {"type": "error", "message": ...}
+"""
+
+import json
+
+DEFAULT_SOCKET = "/tmp/aps_location.sock"
+
+# maximal line length: a done message contains the whole log
+LINE_LIMIT = 1 << 26
+
+
+async def send_message(writer, message: dict):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+async def read_message(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    return json.loads(line)
@@ -0,0 +1,140 @@
+#! /usr/bin/python
+
+import asyncio
+from multiprocessing import Pool
+import os
+
+from .jobs import JobRequest, LRUCache, ModelCache, solve_task
+from .protocol import send_message, read_message, LINE_LIMIT
+
+
+class Job:
+    """
+    Events produced by a job are kept, so
+    a client submitting an identical request,
+    even after the job is completed,
+    receives the whole stream. Only the last
+    completed jobs are kept.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.events = []
+        self.subscribers = []
+
+    def publish(self, event: dict):
+        self.events.append(event)
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+
+    def subscribe(self):
+        queue = asyncio.Queue()
+        for event in self.events:
+            queue.put_nowait(event)
+        self.subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.remove(queue)
+
+
+def is_final(event: dict):
+    return event["type"] in ("done", "error")
+
+
+class Server:
+    def __init__(self, socket_path: str, jobs: int, completed: int = 256):
+        self.socket_path = socket_path
+        self.jobs = jobs
+        self.cache = ModelCache()
+        self.running = {}
+        self.completed = LRUCache(completed)
+
+    async def serve(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        with Pool(self.jobs) as pool:
+            self.pool = pool
+            server = await asyncio.start_unix_server(
+                self.handle, self.socket_path, limit=LINE_LIMIT
+            )
+            async with server:
+                await server.serve_forever()
+
+    async def handle(self, reader, writer):
+        try:
+            message = await read_message(reader)
+            request = JobRequest.from_dict(message)
+            key = request.key()
+        except (OSError, TypeError, ValueError, AttributeError) as err:
+            await send_message(writer, {"type": "error", "message": str(err)})
+            writer.close()
+            return
+
+        job = self.running.get(key) or self.completed.find(key)
+        if job is None:
+            job = Job(key)
+            self.running[key] = job
+            asyncio.create_task(self.run(job, request))
+
+        queue = job.subscribe()
+        try:
+            while True:
+                event = await queue.get()
+                await send_message(writer, event)
+                if is_final(event):
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            job.unsubscribe(queue)
+            writer.close()
+
+    async def run(self, job: Job, request: JobRequest):
+        loop = asyncio.get_running_loop()
+        try:
+            entries = await loop.run_in_executor(None, self.cache.configs, request)
+            search = request.search()
+            results = await asyncio.gather(
+                *(self.solve(job, request, search, *entry) for entry in entries)
+            )
+        except Exception as err:
+            # failed jobs are not cached
+            del self.running[job.key]
+            job.publish({"type": "error", "message": str(err)})
+            return
+        job.publish({"type": "done", "log": results})
+        del self.running[job.key]
+        self.completed.put(job.key, job)
+
+    async def solve(self, job: Job, request: JobRequest, search, conf, count):
+        async def solve_count(i):
+            # workers drop the hints of the jobs not in running
+            running = set(self.running)
+            alpha = await self.submit(
+                solve_task, request, conf, search, job.key, running, i
+            )
+            job.publish(
+                {"type": "result", "config": conf, "count": i + 1, "alpha": alpha}
+            )
+            return alpha
+
+        alphas = await asyncio.gather(*(solve_count(i) for i in range(count)))
+        return conf, alphas
+
+    def submit(self, function, *args):
+        """
+        Run function on the worker pool and
+        return an asyncio future for its result.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def done(value):
+            loop.call_soon_threadsafe(future.set_result, value)
+
+        def fail(err):
+            loop.call_soon_threadsafe(future.set_exception, err)
+
+        self.pool.apply_async(function, args, callback=done, error_callback=fail)
+        return future
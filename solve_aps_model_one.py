@@ -1,26 +1,45 @@
 #! /usr/bin/python
 
 """
-Solve Model 1 exactly with a given 
+Solve Model 1 exactly with a given
 instance configuration.
 """
+
 from argparse import ArgumentParser
-import json
 
 
-from models import MyModelOne, MyModelOneInstance
-from models.utils import grb_vars_to_list, grb_vars_to_matrix
-from utils import load_instance, compute_reach_coefficent, export_results
+import numpy as np
+
+from models import MyModelOne, MyModelOneBenders, MyModelOneInstance
+from utils import (
+    load_instance,
+    compute_reach_coefficent,
+    export_results,
+    export_solution,
+)
 
 
-def solve(distance, lambda_coeff, delta_coeff, alpha, aps_count):
-    model = MyModelOne(distance, lambda_coeff, delta_coeff, 0)
+def solve(
+    distance,
+    lambda_coeff,
+    delta_coeff,
+    alpha,
+    aps_count,
+    backend,
+    start=None,
+    kls=MyModelOne,
+):
+    model = kls(distance, lambda_coeff, delta_coeff, 0, backend)
     model.build_model(aps_count, alpha)
+    if start is not None:
+        model.set_start(start)
     model.solve()
-    y_vars, x_vars = model.get_vars()
-    y_vars = grb_vars_to_list(y_vars)
-    x_vars = grb_vars_to_matrix(x_vars)
-    return y_vars, x_vars
+    return model
+
+
+def check_solution(model, y):
+    (alpha,), (objective,) = model.evaluate(y)
+    print(f"covered customers: {alpha:.4f}, objective: {objective:g}")
 
 
 def parse_args():
@@ -31,6 +50,50 @@ def parse_args():
     )
     parser.add_argument("radius", help="set delta radius", type=int)
     parser.add_argument("aps_count", help="set number of APSs", type=int)
+    parser.add_argument(
+        "--backend",
+        help="set MIP solver backend. Default gurobi",
+        choices=["gurobi", "highs"],
+        default="gurobi",
+    )
+    parser.add_argument(
+        "--heuristic",
+        help="solve with the swap local search instead of the MIP solver",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--benders",
+        help="solve the Benders decomposition: the assignment variables are "
+        "replaced by coverage cuts added lazily",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--warm-start",
+        help="give the local search solution as MIP start",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--time-limit",
+        help="time limit of the local search, in seconds. Default 1",
+        type=float,
+        default=1.0,
+    )
+    parser.add_argument(
+        "--output",
+        help="set output file. Use the .npz extension for the binary format. "
+        "Default results-new.json",
+        default="results-new.json",
+    )
+    parser.add_argument(
+        "--check",
+        help="print the customer coverage and the objective of the solution",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--dense",
+        help="save the full customers x stops assignment matrix (JSON only)",
+        action="store_true",
+    )
 
     return parser.parse_args()
 
@@ -39,14 +102,46 @@ def main():
     args = parse_args()
     instance = load_instance(MyModelOneInstance, args.instance)
     delta_coeff = compute_reach_coefficent(instance.distances, args.radius)
-    y, x = solve(
+    start = None
+    if args.heuristic or args.warm_start:
+        model = MyModelOne(
+            instance.distances, instance.lambda_coeff, delta_coeff, 0, args.backend
+        )
+        result = model.heuristic(args.aps_count, args.alpha, args.time_limit)
+        if not result.feasible:
+            print(f"local search: covered {result.covered} customers, not enough")
+        if args.heuristic:
+            if args.check:
+                check_solution(model, result.facilities)
+            export_solution(args.output, result.facilities, result.assignment)
+            return
+        start = result.facilities
+
+    model = solve(
         instance.distances,
         instance.lambda_coeff,
         delta_coeff,
         args.alpha,
         args.aps_count,
+        args.backend,
+        start,
+        MyModelOneBenders if args.benders else MyModelOne,
     )
-    export_results("results-new.json", y=y, x=x)
+    y = model.get_facilities()
+    if args.check:
+        check_solution(model, y)
+    if args.dense and args.benders:
+        x = np.zeros(delta_coeff.shape, dtype=int)
+        assignment = model.get_assignment()
+        covered = np.flatnonzero(assignment >= 0)
+        x[covered, assignment[covered]] = 1
+        export_results(args.output, y=y.tolist(), x=x.tolist())
+    elif args.dense:
+        _, x = model.get_vars()
+        x = model.values(x).reshape(delta_coeff.shape)
+        export_results(args.output, y=y.tolist(), x=x.tolist())
+    else:
+        export_solution(args.output, y, model.get_assignment())
 
 
 if __name__ == "__main__":
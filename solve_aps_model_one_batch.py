@@ -0,0 +1,164 @@
+#! /usr/bin/python
+
+"""
+Solve Model 1 exactly for many (alpha, radius, aps_count)
+triples. Triples with the same radius share the reach
+matrix and the model: it is built once and solved again
+after changing the right hand sides, with the previous
+solution as MIP start. Radius groups run in parallel.
+"""
+
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from itertools import groupby
+import json
+from multiprocessing import Pool
+
+import numpy as np
+
+from models import MyModelOne, MyModelOneBenders, MyModelOneInstance
+from utils import load_instance, load_json_file, ReachIndex
+
+
+@dataclass
+class GroupCallback:
+    instance: MyModelOneInstance
+    reach_index: ReachIndex
+    threads: int
+    backend: str
+    assignment: bool
+    benders: bool = False
+
+    def callback(self, group):
+        """
+        Solve the (index, alpha, aps_count) items of a radius,
+        return an (index, record) couple for each one
+        """
+        radius, items = group
+        kls = MyModelOneBenders if self.benders else MyModelOne
+        model = kls(
+            self.instance.distances,
+            self.instance.lambda_coeff,
+            self.reach_index.reach(radius),
+            self.threads,
+            self.backend,
+        )
+        output = []
+        built = False
+        start = None
+        for index, alpha, aps_count in items:
+            if built:
+                model.update_model(aps_count, alpha)
+            else:
+                model.build_model(aps_count, alpha)
+                built = True
+            if start is not None:
+                model.set_start(start)
+            model.model.set_param("LogToConsole", 0)
+            status = model.model.optimize(lazy=model.lazy)
+            record = {
+                "alpha": alpha,
+                "radius": radius,
+                "aps_count": aps_count,
+                "status": status.value,
+            }
+            if status.feasible:
+                start = model.get_facilities()
+                # customers within reach of an open stop, whatever
+                # the formulation assigned
+                (alpha,), (objective,) = model.evaluate(start)
+                cust_count, _ = model.delta_coeff.shape
+                record["objective"] = float(objective)
+                record["covered"] = int(round(alpha * cust_count))
+                record["stops"] = np.flatnonzero(start > 0.5).tolist()
+                if self.assignment:
+                    record["assignment"] = model.get_assignment().tolist()
+            output.append((index, record))
+        return output
+
+
+def make_groups(triples):
+    """
+    Group the triples by radius. In each group they are sorted
+    by facility count and decreasing alpha: a solution is then
+    feasible for the next triple with the same count.
+    """
+    items = sorted(
+        (radius, aps_count, -alpha, index)
+        for index, (alpha, radius, aps_count) in enumerate(triples)
+    )
+    return [
+        (radius, [(index, -alpha, count) for _, count, alpha, index in group])
+        for radius, group in groupby(items, key=lambda item: item[0])
+    ]
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("instance", help="specify JSON instance file")
+    parser.add_argument(
+        "triples", help="JSON file with a list of [alpha, radius, aps_count] triples"
+    )
+    parser.add_argument(
+        "output",
+        help="JSON output file: one record for each triple, in the same order",
+    )
+    parser.add_argument(
+        "--backend",
+        help="set MIP solver backend. Default gurobi",
+        choices=["gurobi", "highs"],
+        default="gurobi",
+    )
+    parser.add_argument(
+        "--threads",
+        help="specify the number of thread for the backend solver. Default 0, automatic",
+        type=int,
+        default=0,
+    )
+    parser.add_argument(
+        "--jobs",
+        help="specify the number of radii solved in parallel. Default 1",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--benders",
+        help="solve the Benders decomposition of model one",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--assignment",
+        help="save the stop assigned to each customer (-1 if none) too",
+        action="store_true",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    instance = load_instance(MyModelOneInstance, args.instance)
+    triples = load_json_file(args.triples)
+    cb = GroupCallback(
+        instance,
+        ReachIndex(instance.distances),
+        args.threads,
+        args.backend,
+        args.assignment,
+        args.benders,
+    )
+    groups = make_groups(triples)
+    # largest groups first
+    groups.sort(key=lambda group: -len(group[1]))
+    with Pool(args.jobs) as pool:
+        output = pool.map(cb.callback, groups, chunksize=1)
+
+    records = [None] * len(triples)
+    for group in output:
+        for index, record in group:
+            records[index] = record
+    with open(args.output, "w") as fp:
+        json.dump(records, fp)
+
+
+if __name__ == "__main__":
+    main()
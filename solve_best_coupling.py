@@ -3,6 +3,7 @@
 """
 Solve the best coupling model
 """
+
 from argparse import ArgumentParser
 
 
@@ -15,6 +16,12 @@ def parse_args():
 
     parser.add_argument("distances", help="set distance file")
     # parser.add_argument("radius", help="set max accetable distance", type=int)
+    parser.add_argument(
+        "--backend",
+        help="set MIP solver backend. Default gurobi",
+        choices=["gurobi", "highs"],
+        default="gurobi",
+    )
 
     return parser.parse_args()
 
@@ -25,7 +32,7 @@ def main():
     distances = to_ndarray(data, "distances")
     # delta_coeff = compute_reach_coefficent(distances, args.radius)
 
-    model = FindBestCoupling(distances)
+    model = FindBestCoupling(distances, args.backend)
     model.build_model()
     model.solve()
 
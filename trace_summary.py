@@ -0,0 +1,69 @@
+#! /usr/bin/python
+
+"""
+Summarize a probe trace produced by
+aps_loc_gls.py or aps_loc_one.py with --trace-file.
+Rank the (config, facility count) tasks
+by total time spent.
+"""
+
+from argparse import ArgumentParser
+
+from utils import load_trace
+
+
+def summarize(entries):
+    tasks = {}
+    for e in entries:
+        key = (str(e["config"]), e["count"])
+        try:
+            task = tasks[key]
+        except KeyError:
+            task = {"probes": 0, "build_time": 0.0, "runtime": 0.0, "nodes": 0.0}
+            tasks[key] = task
+        task["probes"] += 1
+        task["build_time"] += e["build_time"]
+        task["runtime"] += e["runtime"]
+        task["nodes"] += e["node_count"] or 0.0
+
+    output = list(tasks.items())
+    output.sort(key=lambda x: -(x[1]["build_time"] + x[1]["runtime"]))
+    return output
+
+
+def print_summary(tasks, top):
+    total = sum(t["build_time"] + t["runtime"] for _, t in tasks)
+    print(
+        f"{'config':>20} {'count':>6} {'probes':>7} {'build':>10} {'solve':>10} {'nodes':>10} {'share':>7}"
+    )
+    for (conf, count), t in tasks[:top]:
+        cost = t["build_time"] + t["runtime"]
+        share = cost / total if total else 0.0
+        print(
+            f"{conf:>20} {count:>6} {t['probes']:>7} {t['build_time']:>10.3f} "
+            f"{t['runtime']:>10.3f} {t['nodes']:>10.0f} {share:>7.1%}"
+        )
+    print(f"total time: {total:.3f}s over {len(tasks)} tasks")
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("trace_file", help="JSON-lines trace file")
+    parser.add_argument(
+        "--top",
+        help="number of tasks to show. Default 20",
+        type=int,
+        default=20,
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    entries = load_trace(args.trace_file)
+    tasks = summarize(entries)
+    print_summary(tasks, args.top)
+
+
+if __name__ == "__main__":
+    main()
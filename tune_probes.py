@@ -0,0 +1,93 @@
+#! /usr/bin/python
+
+"""
+Tune the solver parameters of the feasibility probes
+on the alpha curves of a previous run of aps_loc_gls.py
+or aps_loc_one.py and save them as a profile, to be
+used with --profile.
+"""
+
+from argparse import ArgumentParser
+
+import numpy as np
+
+from models import (
+    GendreauLaporteSemetInstance,
+    MyModelOneInstance,
+    curve_samples,
+    candidate_params,
+    tune,
+    make_model,
+)
+from utils import add_solver_arguments, load_instance, load_json_file, ReachIndex
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("model", help="model of the log", choices=["gls", "one"])
+    parser.add_argument("instance", help="JSON file containing the instance")
+    parser.add_argument("log", help="log of a previous run on the instance")
+    parser.add_argument("profile_file", help="output JSON profile")
+    parser.add_argument(
+        "--samples",
+        help="number of feasible and of infeasible probes timed. Default 10",
+        type=int,
+        default=10,
+    )
+    parser.add_argument(
+        "--offset",
+        help="distance of the sample probes from the logged alpha. Default 0.01",
+        type=float,
+        default=0.01,
+    )
+    parser.add_argument(
+        "--candidates",
+        help="number of parameter sets tried, solver defaults included. Default 12",
+        type=int,
+        default=12,
+    )
+    parser.add_argument(
+        "--split",
+        help="probes below this fraction of the search interval use "
+        "the feasible parameters. Default 0.5",
+        type=float,
+        default=0.5,
+    )
+    parser.add_argument("--seed", help="random seed. Default 0", type=int, default=0)
+    add_solver_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    kls = GendreauLaporteSemetInstance if args.model == "gls" else MyModelOneInstance
+    instance = load_instance(kls, args.instance)
+    reach_index = ReachIndex(instance.distances)
+    samples = []
+    for conf, alphas in load_json_file(args.log):
+        model = make_model(
+            args.model, instance, conf, reach_index, args.threads, args.backend
+        )
+        samples.extend(curve_samples(model, alphas, args.offset))
+
+    rng = np.random.default_rng(args.seed)
+    chosen = []
+    for feasible in (True, False):
+        group = [s for s in samples if s.feasible == feasible]
+        size = min(args.samples, len(group))
+        chosen.extend(group[i] for i in sorted(rng.choice(len(group), size, False)))
+
+    time_limit = args.probe_time_limit
+    if time_limit is None:
+        time_limit = 60.0
+    candidates = candidate_params(args.candidates, args.seed)
+    profile, scores = tune(chosen, candidates, time_limit, args.split)
+    for kind, results in scores.items():
+        print(kind)
+        for params, score in sorted(results, key=lambda item: item[1]):
+            print(f"  {score:10.3f} {params or 'defaults'}")
+    profile.save(args.profile_file)
+
+
+if __name__ == "__main__":
+    main()
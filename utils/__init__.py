@@ -1,7 +1,15 @@
 #! /usr/bin/python
 
-from .loader import to_ndarray, load_json_file, load_instance
-from .export import export_results
+from .loader import to_ndarray, load_json_file, load_instance, load_solution
+from .export import export_results, export_solution
 from .log import Log
-from .arg_parser import parse_args
-from .math_utils import compute_reach_coefficent
+from .trace import Trace, load_trace
+from .arg_parser import (
+    parse_args,
+    add_instance_arguments,
+    add_solver_arguments,
+    check_solver_arguments,
+    search_config,
+    deadline,
+)
+from .math_utils import compute_reach_coefficent, ReachIndex, PackedReach
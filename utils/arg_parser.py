@@ -1,10 +1,10 @@
 #! /usr/bin/python
 
 from argparse import ArgumentParser
+import time
 
 
-def parse_args():
-    parser = ArgumentParser()
+def add_instance_arguments(parser: ArgumentParser):
     parser.add_argument(
         "instance",
         help="JSON file containing the instance. Loaded values are not validated",
@@ -18,6 +18,8 @@ def parse_args():
         "log_file", help="Specify output log JSON file. If existing will be overwritten"
     )
 
+
+def add_solver_arguments(parser: ArgumentParser):
     parser.add_argument(
         "--threads",
         help="specify the number of thread for the backend solver. Default 0, automatic",
@@ -25,6 +27,117 @@ def parse_args():
         default=0,
     )
 
+    parser.add_argument(
+        "--probes",
+        help="specify the number of alpha values probed concurrently for each "
+        "facility count (k-ary search). Default 1, binary search",
+        type=int,
+        default=1,
+    )
+
+    parser.add_argument(
+        "--discrete",
+        help="search alpha among the values the model can achieve. "
+        "The result is exact and needs fewer probes",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--warm-start",
+        help="give the last feasible solution as MIP start to the following probes",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--bounds",
+        help="restrict the alpha search using the bounds computed "
+        "by the model without the solver (GLS model only)",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--probe-time-limit",
+        help="time limit of each feasibility probe, in seconds. A probe that "
+        "reaches it is unknown and alpha is logged as a [lower, upper] interval",
+        type=float,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--time-budget",
+        help="total time of the alpha search, in seconds. When it expires alpha "
+        "is logged as the [lower, upper] interval found so far",
+        type=float,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--profile",
+        help="JSON solver parameter profile made by tune_probes.py, applied "
+        "to the probes likely to be feasible or infeasible. Default none",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--backend",
+        help="specify the MIP solver backend. Default gurobi",
+        choices=["gurobi", "highs"],
+        default="gurobi",
+    )
+
+
+def check_solver_arguments(parser: ArgumentParser, args):
+    """
+    Reject option combinations the backend does not
+    support and return args
+    """
+    # a k-ary search cancels the probes made useless by the
+    # others, and HiGHS (scipy milp) cannot be interrupted
+    if args.probes > 1 and args.backend == "highs":
+        parser.error("--probes > 1 requires the gurobi backend")
+    return args
+
+
+def search_config(args):
+    """
+    SearchConfig of the options added by
+    add_solver_arguments (or of a service JobRequest)
+    """
+    # models imports utils
+    from models import SearchConfig, load_profile
+
+    return SearchConfig(
+        probes=args.probes,
+        discrete=args.discrete,
+        warm_start=args.warm_start,
+        bounds=args.bounds,
+        time_limit=args.probe_time_limit,
+        deadline=deadline(args.time_budget),
+        profile=load_profile(args.profile),
+    )
+
+
+def deadline(time_budget):
+    """
+    Absolute deadline of a run starting now,
+    None if time_budget is None
+    """
+    if time_budget is None:
+        return None
+    return time.time() + time_budget
+
+
+def parse_args(add_arguments=None):
+    """
+    add_arguments, if given, is called with the
+    parser to add script specific arguments
+    """
+    parser = ArgumentParser()
+    add_instance_arguments(parser)
+    add_solver_arguments(parser)
+    if add_arguments is not None:
+        add_arguments(parser)
+
     parser.add_argument(
         "--jobs",
         help="specify the number of parallel jobs to run. Default 1",
@@ -32,4 +145,24 @@ def parse_args():
         default=1,
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--decompose",
+        help="solve each connected component of the reach graph separately "
+        "and combine the results. Search options and --trace-file are ignored",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--solutions-file",
+        help="Save the facility vector found for each configuration and facility "
+        "count to this JSON file, as the log. Default none",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--trace-file",
+        help="Save solver statistics of every probe to this JSON-lines file. Default none",
+        default=None,
+    )
+
+    return check_solver_arguments(parser, parser.parse_args())
@@ -2,7 +2,26 @@
 
 import json
 
+import numpy as np
+
 
 def export_results(file_name, **kwargs):
     with open(file_name, "w") as file:
         json.dump(kwargs, file)
+
+
+def export_solution(file_name, y, assignment):
+    """
+    Save the opened facilities and the stop assigned
+    to each customer (-1 if none).
+    A name ending in .npz selects the compressed binary format,
+    any other one JSON.
+    """
+    if file_name.endswith(".npz"):
+        np.savez_compressed(file_name, y=y, assignment=assignment)
+    else:
+        export_results(
+            file_name,
+            y=np.asarray(y).tolist(),
+            assignment=np.asarray(assignment).tolist(),
+        )
@@ -22,3 +22,14 @@ def load_instance(kls, file_name):
     instance = load_json_file(file_name)
     conf = {f.name: to_ndarray(instance, f.name) for f in kls_fields}
     return kls(**conf)
+
+
+def load_solution(file_name):
+    """
+    Load a solution saved as JSON or, for
+    .npz files, in the binary format.
+    """
+    if file_name.endswith(".npz"):
+        with np.load(file_name) as data:
+            return {k: data[k] for k in data.files}
+    return load_json_file(file_name)
@@ -6,3 +6,121 @@ import numpy as np
 def compute_reach_coefficent(distances: np.ndarray, time: float):
     tmp = distances <= time
     return tmp.astype(np.int8)
+
+
+class ReachIndex:
+    """
+    Per instance index of the distance matrix: each row
+    has its columns sorted by distance, so the reach set
+    of any radius is a prefix of the row. Build it once and
+    use it instead of compute_reach_coefficent when many
+    radii are tried on the same instance.
+    """
+
+    def __init__(self, distances: np.ndarray):
+        distances = np.asarray(distances)
+        self.shape = distances.shape
+        self.order = np.argsort(distances, axis=1).astype(np.int32)
+        self.sorted = np.take_along_axis(distances, self.order, axis=1)
+
+    def counts(self, radius: float):
+        """
+        Number of columns within radius, for each row.
+        All the rows are binary searched at once.
+        """
+        rows, cols = self.shape
+        lower = np.zeros(rows, dtype=np.int64)
+        upper = np.full(rows, cols, dtype=np.int64)
+        active = np.arange(rows)
+        while len(active):
+            middle = (lower[active] + upper[active]) // 2
+            inside = self.sorted[active, middle] <= radius
+            lower[active[inside]] = middle[inside] + 1
+            upper[active[~inside]] = middle[~inside]
+            active = active[lower[active] < upper[active]]
+        return lower
+
+    def sparse_reach(self, radius: float):
+        """
+        Reach coefficients as a CSR matrix, built
+        from the row prefixes in O(non zero) time.
+        """
+        # scipy is imported only when a sparse matrix is needed
+        import scipy.sparse as sp
+
+        counts = self.counts(radius)
+        rows, cols = self.shape
+        indptr = np.zeros(rows + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        # flat position of each entry of the prefixes in the index
+        start = np.arange(rows, dtype=np.int64) * cols - indptr[:-1]
+        position = np.arange(indptr[-1]) + np.repeat(start, counts)
+        indices = self.order.ravel()[position]
+        data = np.ones(len(indices), dtype=np.int8)
+        # column indices of each row are in distance order, not sorted
+        return sp.csr_matrix((data, indices, indptr), shape=self.shape)
+
+    def reach(self, radius: float):
+        """
+        Same output of compute_reach_coefficent
+        """
+        reach = self.sparse_reach(radius)
+        rows, cols = self.shape
+        output = np.zeros(self.shape, dtype=np.int8)
+        row_index = np.repeat(np.arange(rows, dtype=np.int64), np.diff(reach.indptr))
+        output.ravel()[row_index * cols + reach.indices] = 1
+        return output
+
+
+# number of set bits of each byte
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class PackedReach:
+    """
+    Reach coefficients with the facility locations of each
+    demand point packed in bits: 8 times smaller than int8.
+    """
+
+    def __init__(self, coeff, chunk: int = 4096):
+        import scipy.sparse as sp
+
+        rows, cols = coeff.shape
+        self.shape = coeff.shape
+        self.bits = np.empty((rows, (cols + 7) // 8), dtype=np.uint8)
+        # sparse or dense input, unpacked a chunk of rows at a time
+        for start in range(0, rows, chunk):
+            block = coeff[start : start + chunk]
+            if sp.issparse(block):
+                block = block.toarray()
+            self.bits[start : start + chunk] = np.packbits(block != 0, axis=1)
+
+    def unpack(self):
+        return np.unpackbits(self.bits, axis=1, count=self.shape[1]).astype(np.int8)
+
+    def counts(self, facilities, memory: int = 1 << 26):
+        """
+        Number of facilities reaching each demand point for a
+        batch of facility vectors (one per row, counts per location).
+        Each bit plane of the counts is and-ed with the packed rows.
+        Return a (batch, demand points) matrix.
+        """
+        facilities = np.atleast_2d(np.asarray(facilities).round().astype(np.int64))
+        batch = facilities.shape[0]
+        output = np.zeros((batch, self.shape[0]), dtype=np.int32)
+        planes = int(facilities.max(initial=0)).bit_length()
+        step = max(1, memory // self.bits.size)
+        for plane in range(planes):
+            packed = np.packbits((facilities >> plane) & 1, axis=1).astype(np.uint8)
+            for start in range(0, batch, step):
+                both = self.bits[np.newaxis] & packed[start : start + step, np.newaxis]
+                count = POPCOUNT[both].sum(axis=2, dtype=np.int32)
+                output[start : start + step] += count << plane
+        return output
+
+    def covered(self, facilities, weights, times: int = 1):
+        """
+        Weight of the demand points reached at least times,
+        for each facility vector of the batch
+        """
+        return (self.counts(facilities) >= times) @ weights
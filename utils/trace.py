@@ -0,0 +1,36 @@
+#! /usr/bin/python
+
+from dataclasses import dataclass, field
+import json
+
+
+@dataclass
+class Trace:
+    """
+    Structured trace of every feasibility probe.
+    Each entry is saved as a JSON object on its own line.
+    When file_name is None nothing is recorded.
+    """
+
+    file_name: str
+    entries: list = field(default_factory=list)
+
+    def add_entries(self, conf, probes):
+        if self.file_name is None:
+            return
+        for count, record in probes:
+            entry = {"config": conf, "count": count}
+            entry.update(record.to_dict())
+            self.entries.append(entry)
+
+    def save(self):
+        if self.file_name is None:
+            return
+        with open(self.file_name, "w") as fp:
+            for entry in self.entries:
+                print(json.dumps(entry), file=fp)
+
+
+def load_trace(file_name):
+    with open(file_name) as fp:
+        return [json.loads(line) for line in fp if line.strip()]